@@ -0,0 +1,56 @@
+"""Throughput of float vs. fixed-point (int64 minor units) vs. Decimal conversion.
+
+    python benchmarks/bench_fixedpoint.py [ROWS]
+"""
+import os
+import sys
+import time
+from decimal import Decimal, ROUND_HALF_EVEN
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from currency_engine import RateTable  # noqa: E402
+from currency_engine.batch import convert_batch  # noqa: E402
+from currency_engine.fixedpoint import convert_fixed  # noqa: E402
+
+TABLE = RateTable("USD", {
+    "USD": 1.0, "GBP": 0.7912, "EUR": 0.9213, "JPY": 151.23, "BHD": 0.376,
+    "INR": 83.12, "BDT": 109.7, "KWD": 0.3072, "AUD": 1.521, "CAD": 1.362,
+})
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - start
+
+
+def decimal_loop(minor, froms, tos):
+    rates = TABLE.rates
+    cent = Decimal("0.01")
+    for a, f, t in zip(minor.tolist(), froms.tolist(), tos.tolist()):
+        (Decimal(a) / 100 * Decimal(repr(rates[t] / rates[f]))).quantize(cent, ROUND_HALF_EVEN)
+
+
+def main(rows=1_000_000):
+    rng = np.random.default_rng(0)
+    codes = np.array(list(TABLE.rates))
+    froms = codes[rng.integers(len(codes), size=rows)]
+    tos = codes[rng.integers(len(codes), size=rows)]
+    minor = rng.integers(1, 10_000_000, size=rows, dtype=np.int64)
+    amounts = minor / 100.0
+
+    sample = min(rows, 100_000)
+    results = {
+        "float": rows / timed(convert_batch, amounts, froms, tos, TABLE),
+        "fixed": rows / timed(convert_fixed, minor, froms, tos, TABLE),
+        "decimal": sample / timed(decimal_loop, minor[:sample], froms[:sample], tos[:sample]),
+    }
+    for name, rate in results.items():
+        print(f"{name:>8}: {rate:>14,.0f} rows/s  ({rate / results['float']:.2f}x float)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
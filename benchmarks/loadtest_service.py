@@ -0,0 +1,107 @@
+"""Load test for `python -m currency_engine serve`, pinned to one core.
+
+Starts the service on a throwaway snapshot and file provider (no network), hammers
+GET /convert over keep-alive connections and fails (exit 1) when throughput
+is under --target conversions per second.
+
+    python benchmarks/loadtest_service.py [--target 3000] [--seconds 5]
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+from currency_engine import RateTable, SnapshotStore  # noqa: E402
+
+RATES = {"USD": 1.0, "GBP": 0.7912, "EUR": 0.9213, "JPY": 151.23, "INR": 83.12, "BDT": 109.7}
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(port, snapshot, provider):
+    env = dict(os.environ, CURRENCY_SNAPSHOT=snapshot, CURRENCY_PROVIDER=provider, PYTHONPATH=ROOT)
+    pin = (lambda: os.sched_setaffinity(0, {0})) if hasattr(os, "sched_setaffinity") else None
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "currency_engine", "serve", "--port", str(port)],
+        env=env, preexec_fn=pin, stderr=subprocess.DEVNULL,
+    )
+    deadline = time.time() + 10
+    while time.time() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.2).close()
+            return proc
+        except OSError:
+            time.sleep(0.05)
+    proc.kill()
+    raise RuntimeError("service did not start")
+
+
+async def client(port, request, seconds, counts):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        writer.write(request)
+        head = await reader.readuntil(b"\r\n\r\n")
+        length = int(head.split(b"Content-Length: ", 1)[1].split(b"\r\n", 1)[0])
+        body = await reader.readexactly(length)
+        if not head.startswith(b"HTTP/1.1 200"):
+            raise RuntimeError(body.decode())
+        counts[0] += 1
+    writer.close()
+
+
+async def run(port, request, seconds, connections):
+    counts = [0]
+    start = time.perf_counter()
+    await asyncio.gather(*(client(port, request, seconds, counts) for _ in range(connections)))
+    return counts[0] / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--target", type=float, default=3000, help="minimum single conversions/s")
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--connections", type=int, default=16)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        snapshot = os.path.join(tmp, "rates.sqlite3")
+        SnapshotStore(snapshot).save(RateTable("USD", RATES))
+        # The service's background refresher reads these files, never the network
+        with open(os.path.join(tmp, "USD.json"), "w", encoding="utf-8") as f:
+            json.dump({"result": "success", "base_code": "USD", "rates": RATES}, f)
+        port = free_port()
+        proc = start_server(port, snapshot, f"file:{tmp}")
+        try:
+            single = asyncio.run(run(
+                port, b"GET /convert?amount=1,250.50&from=GBP&to=JPY HTTP/1.1\r\nHost: x\r\n\r\n",
+                args.seconds, args.connections,
+            ))
+            body = b'{"amounts": [' + b",".join([b"100.5"] * 1000) + b'], "from": "GBP", "to": "INR"}'
+            batch = asyncio.run(run(
+                port, b"POST /convert/batch HTTP/1.1\r\nHost: x\r\nContent-Length: %d\r\n\r\n%s" % (len(body), body),
+                args.seconds, 4,
+            ))
+        finally:
+            proc.terminate()
+            proc.wait()
+
+    print(f"single: {single:,.0f} conversions/s (target {args.target:,.0f})")
+    print(f" batch: {batch * 1000:,.0f} conversions/s ({batch:,.0f} requests of 1000)")
+    return 0 if single >= args.target else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,216 @@
+"""Benchmark suite for the fetch, parse, convert and render hot paths.
+
+Runs entirely against a local stub of the rates API (no network), prints a
+summary and writes machine-readable results to
+benchmarks/results/<commit>.json. Pass --compare OLD.json to print the
+ratio of every metric against an earlier run.
+
+    python benchmarks/run.py [--latency 0.02] [--quick] [--compare OLD.json]
+"""
+import argparse
+import importlib.util
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+from currency_engine import (  # noqa: E402
+    ANCHOR, TICKER_CURRENCIES, CrossRateEngine, OpenERAPIProvider, RateCache, build_ticker,
+)
+from currency_engine import transport  # noqa: E402
+from currency_engine.api import parse_table  # noqa: E402
+from currency_engine.stubserver import StubRatesServer  # noqa: E402
+
+# A provider-sized table (~160 currencies) for parse and batch benchmarks.
+FULL_RATES = {"USD": 1.0, **{f"C{i:02d}": 0.5 + i * 0.37 for i in range(160)}}
+
+
+def latency(fn, n, setup=None):
+    """Per-call latency stats in microseconds; `setup()` runs untimed before each call."""
+    samples = []
+    for _ in range(n):
+        if setup is not None:
+            setup()
+        start = time.perf_counter_ns()
+        fn()
+        samples.append((time.perf_counter_ns() - start) / 1000)
+    samples.sort()
+    return {
+        "n": n,
+        "mean_us": statistics.fmean(samples),
+        "p50_us": samples[n // 2],
+        "p95_us": samples[min(n - 1, int(n * 0.95))],
+    }
+
+
+def throughput(fn, items, repeat=3):
+    """Best-of-`repeat` items per second for one call of `fn`."""
+    best = min(_timed(fn) for _ in range(repeat))
+    return {"items": items, "per_s": items / best}
+
+
+def _timed(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def _drop_session():
+    """Close the shared keep-alive session, so the next fetch opens a new connection."""
+    session, transport._session = transport._session, None
+    if session is not None:
+        session.close()
+
+
+def bench_fetch(stub, n):
+    provider = OpenERAPIProvider(stub.url)
+    warm_cache = RateCache(provider)
+    warm_cache.get(ANCHOR)
+    return {
+        # a cold fetch: empty cache, no pooled connection
+        "fetch_cold": latency(lambda: RateCache(provider).get(ANCHOR), n, setup=_drop_session),
+        "fetch_warm": latency(lambda: warm_cache.get(ANCHOR), n * 100),
+    }
+
+
+def bench_parse(n):
+    body = json.dumps({"result": "success", "base_code": "USD", "rates": FULL_RATES})
+    return {"parse_json": latency(lambda: parse_table("USD", json.loads(body)), n)}
+
+
+def bench_convert(stub, rows):
+    engine = CrossRateEngine(RateCache(OpenERAPIProvider(stub.url)))
+    engine.rate("GBP", "JPY")
+    calls = 100_000
+
+    def single():
+        for _ in range(calls):
+            engine.rate("GBP", "JPY")
+
+    from currency_engine import RateTable
+    from currency_engine.batch import convert_batch
+
+    table = RateTable("USD", FULL_RATES)
+    codes = np.array(list(FULL_RATES))
+    rng = np.random.default_rng(0)
+    amounts = rng.random(rows) * 1000
+    froms, tos = codes[rng.integers(len(codes), size=rows)], codes[rng.integers(len(codes), size=rows)]
+    return {
+        "convert_single": throughput(single, calls),
+        "convert_batch": throughput(lambda: convert_batch(amounts, froms, tos, table), rows),
+    }
+
+
+def bench_ticker(stub, n):
+    engine = CrossRateEngine(RateCache(OpenERAPIProvider(stub.url)))
+    engine.anchor_table()
+    results = {"build_ticker": latency(lambda: build_ticker("GBP", engine.quotes("GBP", TICKER_CURRENCIES)), n)}
+
+    # The Tkinter method, loaded without creating a window
+    spec = importlib.util.spec_from_file_location("tk_app", os.path.join(ROOT, "tkinter", "app.py"))
+    try:
+        tk_app = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(tk_app)
+    except ImportError:
+        return results
+    app = tk_app.CurrencyConverterApp.__new__(tk_app.CurrencyConverterApp)
+    app.engine = engine
+    results["build_ticker_text"] = latency(
+        lambda: app.build_ticker_text("GBP", engine.quotes("GBP", TICKER_CURRENCIES)), n
+    )
+    return results
+
+
+def bench_streamlit(n):
+    try:
+        from streamlit.testing.v1 import AppTest
+    except ImportError:
+        return {}
+    at = AppTest.from_file(os.path.join(ROOT, "web_app.py"), default_timeout=60)
+    start = time.perf_counter()
+    at.run()
+    first = (time.perf_counter() - start) * 1e6
+    if at.exception:
+        raise RuntimeError(at.exception[0].message)
+    at.text_input[0].input("1,250.50")
+    rerun = latency(lambda: at.button[1].click().run(), n)  # Convert
+    return {"streamlit_first_run": {"n": 1, "mean_us": first, "p50_us": first, "p95_us": first},
+            "streamlit_rerun": rerun}
+
+
+def commit():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, text=True, stderr=subprocess.DEVNULL
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def headline(metric):
+    return metric["per_s"] if "per_s" in metric else metric["p50_us"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--latency", type=float, default=0.02, help="stub API latency in seconds")
+    parser.add_argument("--quick", action="store_true", help="fewer iterations")
+    parser.add_argument("--output", help="default: benchmarks/results/<commit>.json")
+    parser.add_argument("--compare", help="earlier results file to compare against")
+    args = parser.parse_args()
+    n = 20 if args.quick else 100
+    old = {}
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            old = json.load(f)["metrics"]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        stub = StubRatesServer(latency=args.latency).start()
+        # Point everything that builds its own provider (the Streamlit app) at the stub
+        os.environ.update(
+            CURRENCY_PROVIDER=stub.url,
+            CURRENCY_SNAPSHOT=os.path.join(tmp, "rates.sqlite3"),
+            CURRENCY_HISTORY=os.path.join(tmp, "history"),
+            CURRENCY_ALERTS=os.path.join(tmp, "alerts.json"),
+        )
+        metrics = {}
+        metrics.update(bench_fetch(stub, n))
+        metrics.update(bench_parse(n * 10))
+        metrics.update(bench_convert(stub, 200_000 if args.quick else 1_000_000))
+        metrics.update(bench_ticker(stub, n * 10))
+        metrics.update(bench_streamlit(max(5, n // 10)))
+        stub.shutdown()
+
+    result = {
+        "commit": commit(),
+        "timestamp": int(time.time()),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "stub_latency_s": args.latency,
+        "metrics": metrics,
+    }
+    out = args.output or os.path.join(ROOT, "benchmarks", "results", f"{result['commit']}.json")
+    os.makedirs(os.path.dirname(out), exist_ok=True)
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(result, f, indent=2)
+
+    for name, metric in metrics.items():
+        unit = "/s" if "per_s" in metric else " us p50"
+        line = f"{name:>22}: {headline(metric):>14,.1f}{unit}"
+        if name in old:
+            line += f"   ({headline(metric) / headline(old[name]):.2f}x of {args.compare})"
+        print(line)
+    print(f"wrote {out}")
+
+
+if __name__ == "__main__":
+    main()
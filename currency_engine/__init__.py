@@ -0,0 +1,61 @@
+"""Shared rate fetching and conversion for the Tkinter and Streamlit apps.
+
+Exported names are imported from their modules on first use, so importing
+the package is cheap: numpy, requests and asyncio load only when something
+that needs them is used.
+"""
+import importlib
+
+_EXPORTS = {
+    "Alert": "alerts",
+    "AlertEngine": "alerts",
+    "parse_amount": "amounts",
+    "API_URL": "api",
+    "RateAPIError": "api",
+    "RateTable": "api",
+    "fetch_table": "api",
+    "ANCHOR": "crossrate",
+    "CrossRateEngine": "crossrate",
+    "RateCache": "cache",
+    "CURRENCIES": "currencies",
+    "CURRENCY_NAMES": "currencies",
+    "TICKER_CURRENCIES": "currencies",
+    "CurrencySearch": "currencies",
+    "build_ticker": "currencies",
+    "code_of": "currencies",
+    "currency_label": "currencies",
+    "currency_universe": "currencies",
+    "search_index": "currencies",
+    "HistoryStore": "history",
+    "CURRENCY_INDEX": "matrix",
+    "CurrencyIndex": "matrix",
+    "RateMatrix": "matrix",
+    "record_error": "metrics",
+    "render_prometheus": "metrics",
+    "start_exporters": "metrics",
+    "prefetch": "prefetch",
+    "prefetch_async": "prefetch",
+    "FileProvider": "providers",
+    "OpenERAPIProvider": "providers",
+    "RateProvider": "providers",
+    "provider_from_env": "providers",
+    "BackgroundRefresher": "refresher",
+    "SnapshotStore": "snapshot",
+    "SingleFlight": "singleflight",
+    "LatestTaskPool": "workers",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
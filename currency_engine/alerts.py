@@ -0,0 +1,184 @@
+import bisect
+import json
+import os
+import threading
+from dataclasses import asdict, dataclass
+
+DEFAULT_PATH = os.environ.get(
+    "CURRENCY_ALERTS",
+    os.path.join(os.path.expanduser("~"), ".cache", "currency-converter", "alerts.json"),
+)
+
+ABOVE, BELOW = "above", "below"
+
+
+@dataclass(frozen=True)
+class Alert:
+    """Notify when 1 `from_cur` in `to_cur` crosses `threshold` going `direction`."""
+
+    id: int
+    from_cur: str
+    to_cur: str
+    threshold: float
+    direction: str = ABOVE
+
+    def __str__(self):
+        arrow = "≥" if self.direction == ABOVE else "≤"
+        return f"{self.from_cur}→{self.to_cur} {arrow} {self.threshold:g}"
+
+
+class _PairRules:
+    """Rules for one pair: thresholds sorted ascending, ids in matching order."""
+
+    __slots__ = ("above", "above_ids", "below", "below_ids", "last")
+
+    def __init__(self):
+        self.above, self.above_ids = [], []
+        self.below, self.below_ids = [], []
+        self.last = None
+
+
+def _pair_rate(matrix, pair):
+    i, j = matrix.id_of(pair[0]), matrix.id_of(pair[1])
+    return None if i is None or j is None else matrix.rate(i, j)
+
+
+class AlertEngine:
+    """Threshold rules checked against every freshly fetched rate table.
+
+    Rules are indexed per pair in two sorted threshold lists, one per
+    direction. When a pair moves from its last seen rate to a new one, the
+    rules it crossed form one contiguous slice of the matching list, found
+    with two binary searches, so a refresh costs O(pairs · log rules +
+    fired) however many rules are watching. A rule fires on each crossing,
+    not while the rate stays beyond it. A pair's baseline is its rate in the
+    previous table checked; the very first table only sets baselines.
+
+    Subscribe `check` to a `RateCache`; `notify(alert, rate)` is called for
+    each rule that fires. An engine made by `load` re-reads its file at the
+    start of a check whenever the file's mtime changed, so rules added with
+    `python -m currency_engine alert` reach running apps on the next refresh.
+    """
+
+    def __init__(self, notify=None, path=None):
+        self.notify = notify
+        self.path = path
+        self._mtime = None
+        self._previous = None  # matrix of the last table checked
+        self._pairs = {}
+        self._alerts = {}
+        self._next_id = 1
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._alerts)
+
+    def alerts(self) -> list:
+        with self._lock:
+            return sorted(self._alerts.values(), key=lambda a: a.id)
+
+    def add(self, from_cur: str, to_cur: str, threshold: float, direction=ABOVE, alert_id=None) -> Alert:
+        if direction not in (ABOVE, BELOW):
+            raise ValueError(f"direction must be {ABOVE!r} or {BELOW!r}")
+        with self._lock:
+            if alert_id is None:
+                alert_id = self._next_id
+            self._next_id = max(self._next_id, alert_id + 1)
+            alert = Alert(alert_id, from_cur, to_cur, float(threshold), direction)
+            self._alerts[alert_id] = alert
+            rules = self._pairs.setdefault((from_cur, to_cur), _PairRules())
+            keys, ids = (rules.above, rules.above_ids) if direction == ABOVE else (rules.below, rules.below_ids)
+            i = bisect.bisect_right(keys, alert.threshold)
+            keys.insert(i, alert.threshold)
+            ids.insert(i, alert_id)
+        return alert
+
+    def remove(self, alert_id: int) -> Alert:
+        """Drop a rule; KeyError if there is none with that id."""
+        with self._lock:
+            alert = self._alerts.pop(alert_id)
+            rules = self._pairs[alert.from_cur, alert.to_cur]
+            keys, ids = (rules.above, rules.above_ids) if alert.direction == ABOVE else (rules.below, rules.below_ids)
+            i = bisect.bisect_left(keys, alert.threshold)
+            while ids[i] != alert_id:
+                i += 1
+            del keys[i], ids[i]
+            if not (rules.above or rules.below):
+                del self._pairs[alert.from_cur, alert.to_cur]
+        return alert
+
+    def check(self, table) -> list:
+        """Fire the rules `table` crossed; returns `[(alert, rate)]`."""
+        if self.path is not None:
+            self.reload()
+        matrix = table.matrix
+        fired = []
+        with self._lock:
+            previous, self._previous = self._previous, matrix
+            for pair, rules in self._pairs.items():
+                rate = _pair_rate(matrix, pair)
+                if rate is None:
+                    continue
+                last, rules.last = rules.last, rate
+                if last is None and previous is not None:  # pair added since the last check
+                    last = _pair_rate(previous, pair)
+                if last is None or rate == last:
+                    continue
+                if rate > last:  # rising through last < threshold <= rate
+                    keys, ids = rules.above, rules.above_ids
+                    lo, hi = bisect.bisect_right(keys, last), bisect.bisect_right(keys, rate)
+                else:  # falling through rate <= threshold < last
+                    keys, ids = rules.below, rules.below_ids
+                    lo, hi = bisect.bisect_left(keys, rate), bisect.bisect_left(keys, last)
+                fired.extend((self._alerts[a], rate) for a in ids[lo:hi])
+        if self.notify is not None:
+            for alert, rate in fired:
+                self.notify(alert, rate)
+        return fired
+
+    __call__ = check
+
+    # ----- persistence: a JSON list of rules -----
+    @classmethod
+    def load(cls, path=DEFAULT_PATH, notify=None) -> "AlertEngine":
+        engine = cls(notify, path)
+        engine.reload()
+        return engine
+
+    def reload(self) -> bool:
+        """Re-read the rules from `path` if it changed since the last read.
+
+        Pairs keep their last seen rate, so a reload never fires by itself.
+        A file that can't be read or parsed leaves the current rules alone.
+        """
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except FileNotFoundError:
+            mtime = None
+        except OSError:
+            return False
+        if mtime == self._mtime:
+            return False
+        fresh = AlertEngine()
+        if mtime is not None:
+            try:
+                with open(self.path, encoding="utf-8") as f:
+                    for rule in json.load(f):
+                        fresh.add(rule["from_cur"], rule["to_cur"], rule["threshold"], rule["direction"], rule["id"])
+            except (OSError, ValueError, KeyError, TypeError):
+                return False
+        with self._lock:
+            for pair, rules in fresh._pairs.items():
+                if pair in self._pairs:
+                    rules.last = self._pairs[pair].last
+            self._pairs, self._alerts, self._next_id = fresh._pairs, fresh._alerts, fresh._next_id
+            self._mtime = mtime
+        return True
+
+    def save(self, path=None):
+        path = path or self.path or DEFAULT_PATH
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump([asdict(a) for a in self.alerts()], f, indent=1)
+        os.replace(tmp, path)
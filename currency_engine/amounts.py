@@ -0,0 +1,10 @@
+def parse_amount(text: str):
+    """Positive float from user text ("1,250.50" → 1250.5), else None."""
+    t = (text or "").strip().replace(",", "")
+    if not t:
+        return None
+    try:
+        v = float(t)
+        return v if v > 0 else None
+    except ValueError:
+        return None
@@ -0,0 +1,57 @@
+import time
+from dataclasses import dataclass, field
+from functools import cached_property
+
+API_URL = "https://open.er-api.com/v6/latest/{}"
+
+
+class RateAPIError(RuntimeError):
+    """The rates API answered, but not with a usable table."""
+
+    def __init__(self, message, status_code=None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+@dataclass(frozen=True)
+class RateTable:
+    """One provider table: 1 `base` = `rates[code]` units of `code`."""
+
+    base: str
+    rates: dict
+    fetched_at: float = field(default_factory=time.time)
+    updated_unix: int = None
+    next_update_unix: int = None
+    # HTTP validators for conditional refetches
+    etag: str = None
+    last_modified: str = None
+
+    def age(self, now=None):
+        return (now if now is not None else time.time()) - self.fetched_at
+
+    @cached_property
+    def matrix(self):
+        """Array-backed `RateMatrix` of these rates, built once per table."""
+        from .matrix import RateMatrix
+
+        return RateMatrix(self.rates)
+
+
+def parse_table(base: str, data: dict, etag=None, last_modified=None) -> RateTable:
+    if data.get("result") != "success":
+        raise RateAPIError("API did not return success")
+    return RateTable(
+        base=data.get("base_code", base),
+        rates=data.get("rates", {}),
+        updated_unix=data.get("time_last_update_unix"),
+        next_update_unix=data.get("time_next_update_unix"),
+        etag=etag,
+        last_modified=last_modified,
+    )
+
+
+def fetch_table(base: str, previous: RateTable = None) -> RateTable:
+    """Fetch `base` from the configured provider (see `providers.provider_from_env`)."""
+    from .providers import default_provider
+
+    return default_provider().fetch(base, previous)
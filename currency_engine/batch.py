@@ -0,0 +1,44 @@
+import numpy as np
+
+from .api import RateTable
+
+
+def _ids(codes, matrix):
+    """Ids of codes `matrix` quotes; KeyError naming any it doesn't.
+
+    Lookups only: interning query codes would let callers grow the shared
+    `CURRENCY_INDEX` (and every table's padded vector) without bound.
+    """
+    if isinstance(codes, str):
+        i = matrix.id_of(codes)
+        if i is None:
+            raise KeyError(codes)
+        return i
+    uniques, inverse = np.unique(np.asarray(codes), return_inverse=True)
+    ids = [matrix.id_of(str(c)) for c in uniques]
+    unknown = [str(c) for c, i in zip(uniques, ids) if i is None]
+    if unknown:
+        raise KeyError(", ".join(unknown))
+    return np.array(ids, dtype=np.intp)[inverse]
+
+
+def pair_rates(from_codes, to_codes, table: RateTable):
+    """`(src_ids, dst_ids, rates)` for single codes or arrays of codes.
+
+    Rates are triangulated through the table's `RateMatrix`, whatever its
+    base. Raises KeyError for an unknown code.
+    """
+    matrix = table.matrix
+    src = _ids(from_codes, matrix)
+    dst = _ids(to_codes, matrix)
+    return src, dst, matrix.rates(src, dst)
+
+
+def convert_batch(amounts, from_codes, to_codes, table: RateTable) -> np.ndarray:
+    """Convert many amounts in one vectorised pass.
+
+    `from_codes` and `to_codes` are either a single currency code or an array
+    with one code per amount (see `pair_rates`).
+    """
+    _, _, rates = pair_rates(from_codes, to_codes, table)
+    return np.asarray(amounts, dtype=np.float64) * rates
@@ -0,0 +1,115 @@
+import logging
+import threading
+
+from .api import RateTable, fetch_table
+from .metrics import CACHE_REQUESTS, track_cache
+from .schedule import refresh_delay
+from .singleflight import SingleFlight
+
+log = logging.getLogger(__name__)
+
+
+class RateCache:
+    """In-process rate tables keyed by base, with stale-while-revalidate.
+
+    A fresh table is returned straight from memory. Once it is due for a
+    refresh (see `schedule.refresh_delay`: the provider's next update time,
+    or `ttl` seconds when the provider gives none) the stale table is still
+    returned immediately and a single background thread fetches its
+    replacement. Only a base that has never
+    been loaded blocks on the network.
+
+    With a `snapshot` store the cache starts out holding the last good tables
+    from disk (stale ones are revalidated on first use) and every fresh table
+    is written back, so a cold start can convert offline.
+
+    Concurrent fetches of the same base share a single upstream request.
+    Functions registered with `subscribe` see every freshly fetched table.
+
+    `loader(base, previous)` gets the table being replaced (or None) so it
+    can make a conditional request.
+    """
+
+    def __init__(self, loader=fetch_table, ttl=300, snapshot=None):
+        self.loader = loader
+        self.ttl = ttl
+        self.snapshot = snapshot
+        self._tables = {}
+        if snapshot is not None:
+            try:
+                self._tables = snapshot.load_all()
+            except Exception as e:  # unreadable or corrupt: start cold instead
+                log.warning("rate snapshot not loaded: %s", e)
+        self._refreshing = set()
+        self._flight = SingleFlight()
+        self._listeners = []
+        self._lock = threading.Lock()
+        track_cache(self)
+
+    def get(self, base: str) -> RateTable:
+        table = self._tables.get(base)
+        if table is None:
+            CACHE_REQUESTS.inc("miss")
+            return self.refresh(base)
+        if refresh_delay(table, fallback=self.ttl) <= 0:
+            CACHE_REQUESTS.inc("stale")
+            self._revalidate(base)
+        else:
+            CACHE_REQUESTS.inc("hit")
+        return table
+
+    __call__ = get
+
+    def peek(self, base: str):
+        """Cached table for `base` (possibly stale), or None. Never fetches."""
+        return self._tables.get(base)
+
+    def tables(self) -> dict:
+        """Every cached table by base, as a copy. Never fetches."""
+        with self._lock:
+            return dict(self._tables)
+
+    def refresh(self, base: str) -> RateTable:
+        """Fetch `base` now and store it, joining a fetch already in flight."""
+        return self._flight.do(base, self._load, base)
+
+    def _load(self, base):
+        table = self.loader(base, self._tables.get(base))
+        with self._lock:
+            self._tables[base] = table
+        if self.snapshot is not None:
+            try:
+                self.snapshot.save(table)
+            except Exception:
+                pass  # a read-only or locked snapshot must not fail a fetch
+        for listener in self._listeners:
+            try:
+                listener(table)
+            except Exception:
+                pass  # a broken listener must not fail a fetch either
+        return table
+
+    def subscribe(self, listener):
+        """Call `listener(table)` after each successful fetch."""
+        self._listeners.append(listener)
+        return listener
+
+    def clear(self):
+        with self._lock:
+            self._tables.clear()
+
+    def _revalidate(self, base):
+        with self._lock:
+            if base in self._refreshing:
+                return
+            self._refreshing.add(base)
+        threading.Thread(target=self._background_refresh, args=(base,), daemon=True).start()
+
+    def _background_refresh(self, base):
+        try:
+            self.refresh(base)
+        except Exception:
+            pass  # keep serving the stale table; the next get() retries
+        finally:
+            with self._lock:
+                self._refreshing.discard(base)
@@ -0,0 +1,337 @@
+import argparse
+import csv
+import itertools
+import json
+import sys
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+
+from .alerts import ABOVE, BELOW, AlertEngine
+from .amounts import parse_amount
+from .cache import RateCache
+from .crossrate import ANCHOR
+from .fixedpoint import convert_fixed, format_minor, to_minor
+from .history import HistoryStore
+from .snapshot import SnapshotStore
+
+
+def _open(path, mode):
+    if path == "-":
+        return sys.stdin if "r" in mode else sys.stdout
+    return open(path, mode, newline="", encoding="utf-8")
+
+
+def _detect_format(path, given):
+    if given:
+        return given
+    return "jsonl" if path.endswith((".jsonl", ".ndjson")) else "csv"
+
+
+def _read_rows(stream, fmt):
+    if fmt == "jsonl":
+        return _jsonl_rows(stream), None
+    reader = csv.DictReader(stream)
+    return reader, reader.fieldnames
+
+
+def _jsonl_rows(lines):
+    """Objects from JSONL `lines`; a line that isn't one becomes an empty row.
+
+    An empty row converts to a blank output and is counted as skipped, like
+    a bad CSV row, so one corrupt line doesn't abort a long run.
+    """
+    for line in lines:
+        if line.strip():
+            try:
+                row = json.loads(line)
+            except ValueError:
+                row = None
+            yield row if isinstance(row, dict) else {}
+
+
+def _row_codes(row, args):
+    """`(from, to)` codes of `row`; a non-string value counts as unknown (None)."""
+    f = row.get(args.from_column) if args.from_column else args.from_code
+    t = row.get(args.to_column) if args.to_column else args.to_code
+    return (f if isinstance(f, str) else None), (t if isinstance(t, str) else None)
+
+
+def _chunks(rows, size):
+    rows = iter(rows)
+    while True:
+        chunk = list(itertools.islice(rows, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def convert_chunk(rows, table, args):
+    """Add `args.output_column` to each row of one chunk, vectorised.
+
+    Rows whose amount fails `parse_amount` or whose currency is unknown get
+    an empty output value. Returns the number of rows left unconverted.
+    """
+    matrix = table.matrix
+    n = len(rows)
+    amounts = np.empty(n, dtype=np.float64)
+    src = np.empty(n, dtype=np.intp)
+    dst = np.empty(n, dtype=np.intp)
+    for i, row in enumerate(rows):
+        amt = parse_amount(str(row.get(args.amount_column, "")))
+        f, t = _row_codes(row, args)
+        s, d = matrix.id_of(f), matrix.id_of(t)
+        if amt is None or s is None or d is None:
+            amounts[i], s, d = np.nan, 0, 0
+        else:
+            amounts[i] = amt
+        src[i], dst[i] = s, d
+
+    converted = amounts * matrix.rates(src, dst)
+    skipped = 0
+    for row, value in zip(rows, converted.tolist()):
+        if value != value:  # NaN
+            row[args.output_column] = ""
+            skipped += 1
+        else:
+            row[args.output_column] = round(value, args.decimals)
+    return skipped
+
+
+def convert_chunk_fixed(rows, table, args):
+    """`convert_chunk` in integer minor units; outputs exact decimal strings."""
+    matrix = table.matrix
+    valid, amounts, froms, tos = [], [], [], []
+    for row in rows:
+        f, t = _row_codes(row, args)
+        minor = None
+        if matrix.id_of(f) is not None and matrix.id_of(t) is not None:
+            minor = to_minor(row.get(args.amount_column, ""), f)
+        if minor is None:
+            row[args.output_column] = ""
+            continue
+        valid.append(row)
+        amounts.append(minor)
+        froms.append(f)
+        tos.append(t)
+
+    converted = []
+    if valid:
+        try:
+            converted = convert_fixed(np.array(amounts, dtype=np.int64), froms, tos, table).tolist()
+        except OverflowError:  # some row doesn't fit int64: redo row by row, blanking those
+            converted = [_convert_one_fixed(*row, table) for row in zip(amounts, froms, tos)]
+        for row, minor, t in zip(valid, converted, tos):
+            row[args.output_column] = "" if minor is None else format_minor(minor, t)
+    return len(rows) - sum(minor is not None for minor in converted)
+
+
+def _convert_one_fixed(minor, f, t, table):
+    try:
+        return int(convert_fixed(np.array([minor], dtype=np.int64), [f], [t], table)[0])
+    except OverflowError:
+        return None
+
+
+def convert_stream(table, args, in_fmt, out_fmt):
+    """Single-process conversion, one chunk in memory at a time."""
+    total = skipped = 0
+    with _open(args.input, "r") as src, _open(args.output, "w") as dst:
+        rows, fieldnames = _read_rows(src, in_fmt)
+        writer = None
+        for chunk in _chunks(rows, args.chunk_size):
+            skipped += (convert_chunk_fixed if args.fixed_point else convert_chunk)(chunk, table, args)
+            if out_fmt == "jsonl":
+                dst.writelines(json.dumps(row, ensure_ascii=False) + "\n" for row in chunk)
+            else:
+                if writer is None:
+                    fields = list(fieldnames or chunk[0])
+                    if args.output_column not in fields:
+                        fields.append(args.output_column)
+                    writer = csv.DictWriter(dst, fieldnames=fields, extrasaction="ignore")
+                    writer.writeheader()
+                writer.writerows(chunk)
+            total += len(chunk)
+    return total, skipped
+
+
+def _rates_time(table):
+    if table.updated_unix is None:
+        return "an unknown time"
+    return datetime.fromtimestamp(table.updated_unix, timezone.utc).strftime("%Y-%m-%d %H:%M UTC")
+
+
+def cmd_convert(args):
+    in_fmt = _detect_format(args.input, args.format)
+    out_fmt = in_fmt if args.output == "-" else _detect_format(args.output, args.format)
+    # A batch run converts with the latest rates, not whatever the snapshot holds
+    cache = RateCache(snapshot=SnapshotStore.open())
+    try:
+        table = cache.refresh(ANCHOR)
+    except Exception as e:
+        table = cache.peek(ANCHOR)
+        if table is None:
+            print(f"No {ANCHOR} rates: {e}", file=sys.stderr)
+            return 1
+        print(f"Rates not refreshed ({e}); using the saved {ANCHOR} table", file=sys.stderr)
+
+    start = time.perf_counter()
+    # Byte-range splitting needs real files, and workers write the input's format
+    if args.workers > 1 and "-" not in (args.input, args.output) and in_fmt == out_fmt:
+        from .parallel import convert_file_parallel
+
+        total, skipped = convert_file_parallel(table, args, in_fmt, args.workers)
+    else:
+        total, skipped = convert_stream(table, args, in_fmt, out_fmt)
+
+    elapsed = time.perf_counter() - start
+    rate = total / elapsed if elapsed else float("inf")
+    print(
+        f"Converted {total - skipped:,} of {total:,} rows in {elapsed:.2f}s ({rate:,.0f} rows/s)"
+        f"; rates as of {_rates_time(table)}",
+        file=sys.stderr,
+    )
+    return 0
+
+
+def _timestamp(text):
+    when = datetime.fromisoformat(text)
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return when.timestamp()
+
+
+def cmd_history(args):
+    store = HistoryStore.open()
+    if store is None:
+        return 1
+    if args.at:
+        rate = store.rate_as_of(args.from_code, args.to_code, _timestamp(args.at))
+        if rate is None:
+            print(f"No {args.from_code}→{args.to_code} history at {args.at}", file=sys.stderr)
+            return 1
+        print(f"{rate:.6f}")
+        return 0
+    start = _timestamp(args.since) if args.since else 0
+    end = _timestamp(args.until) if args.until else None
+    times, rates = store.pair_range(args.from_code, args.to_code, start, end)
+    for t, rate in zip(times.tolist(), rates.tolist()):
+        print(f"{datetime.fromtimestamp(t, timezone.utc).isoformat()},{rate:.6f}")
+    return 0
+
+
+def cmd_alert(args):
+    alerts = AlertEngine.load()
+    if args.action == "add":
+        alert = alerts.add(args.from_code, args.to_code, args.threshold, BELOW if args.below else ABOVE)
+        alerts.save()
+        print(f"{alert.id}\t{alert}")
+    elif args.action == "remove":
+        try:
+            alerts.remove(args.id)
+        except KeyError:
+            print(f"No alert {args.id}", file=sys.stderr)
+            return 1
+        alerts.save()
+    else:
+        for alert in alerts.alerts():
+            print(f"{alert.id}\t{alert}")
+    return 0
+
+
+def cmd_serve(args):
+    import asyncio
+
+    from .service import serve
+
+    print(f"Serving conversions on http://{args.host}:{args.port}", file=sys.stderr)
+    try:
+        asyncio.run(serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def cmd_stub(args):
+    from .stubserver import StubRatesServer
+
+    server = StubRatesServer(
+        (args.host, args.port), latency=args.latency, jitter=args.jitter,
+        error_rate=args.error_rate, error_status=args.error_status,
+    )
+    print(f"Stub rates API: CURRENCY_PROVIDER={server.url}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m currency_engine")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    conv = sub.add_parser("convert", help="stream a CSV/JSONL file of amounts through the converter")
+    conv.add_argument("input", help="input file, or - for stdin")
+    conv.add_argument("output", help="output file, or - for stdout")
+    conv.add_argument("--format", choices=["csv", "jsonl"], help="default: from the file extension")
+    conv.add_argument("--amount-column", default="amount")
+    src = conv.add_mutually_exclusive_group(required=True)
+    src.add_argument("--from", dest="from_code", help="source currency for every row")
+    src.add_argument("--from-column", help="column holding each row's source currency")
+    dst = conv.add_mutually_exclusive_group(required=True)
+    dst.add_argument("--to", dest="to_code", help="target currency for every row")
+    dst.add_argument("--to-column", help="column holding each row's target currency")
+    conv.add_argument("--output-column", default="converted")
+    conv.add_argument("--decimals", type=int, default=2, help="float mode only")
+    conv.add_argument(
+        "--fixed-point", action="store_true",
+        help="convert in integer minor units with banker's rounding (exact, per-currency decimals)",
+    )
+    conv.add_argument("--chunk-size", type=int, default=10_000, help="rows held in memory at once")
+    conv.add_argument(
+        "--workers", type=int, default=1,
+        help="processes for large files (one record per line); e.g. os.cpu_count()",
+    )
+    conv.set_defaults(func=cmd_convert)
+
+    hist = sub.add_parser("history", help="recorded rates for a pair (CSV of time,rate)")
+    hist.add_argument("from_code", metavar="FROM")
+    hist.add_argument("to_code", metavar="TO")
+    hist.add_argument("--at", help="print the single rate in force at this ISO date/time")
+    hist.add_argument("--since", help="ISO date/time, default: start of history")
+    hist.add_argument("--until", help="ISO date/time, default: now")
+    hist.set_defaults(func=cmd_history)
+
+    alert = sub.add_parser("alert", help="manage rate threshold alerts (checked by the apps on every refresh)")
+    alert_sub = alert.add_subparsers(dest="action")
+    alert_add = alert_sub.add_parser("add", help="notify when FROM→TO crosses THRESHOLD")
+    alert_add.add_argument("from_code", metavar="FROM")
+    alert_add.add_argument("to_code", metavar="TO")
+    alert_add.add_argument("threshold", type=float)
+    alert_add.add_argument("--below", action="store_true", help="fire on a fall through THRESHOLD instead of a rise")
+    alert_rm = alert_sub.add_parser("remove", help="delete an alert by id")
+    alert_rm.add_argument("id", type=int)
+    alert_sub.add_parser("list", help="print every alert (the default)")
+    alert.set_defaults(func=cmd_alert)
+
+    srv = sub.add_parser("serve", help="run the local JSON conversion service")
+    srv.add_argument("--host", default="127.0.0.1")
+    srv.add_argument("--port", type=int, default=8080)
+    srv.set_defaults(func=cmd_serve)
+
+    stub = sub.add_parser("stub", help="run a local fake of the rates API (latency/error injection)")
+    stub.add_argument("--host", default="127.0.0.1")
+    stub.add_argument("--port", type=int, default=8081)
+    stub.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    stub.add_argument("--jitter", type=float, default=0.0, help="extra random seconds, up to this")
+    stub.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests that fail")
+    stub.add_argument("--error-status", type=int, default=503)
+    stub.set_defaults(func=cmd_stub)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
@@ -0,0 +1,113 @@
+import threading
+from time import perf_counter
+
+from .api import RateTable, fetch_table
+from .metrics import CONVERT_SECONDS
+
+ANCHOR = "USD"
+
+
+def quote_error(value: float) -> float:
+    """Relative rounding error of a provider quote, from its printed decimals."""
+    text = repr(float(value))
+    if "e" in text or "." not in text:
+        return 0.0
+    decimals = len(text.split(".", 1)[1])
+    return 0.5 * 10 ** -decimals / abs(value) if value else float("inf")
+
+
+class CrossRateEngine:
+    """Serve any A→B rate from a single anchor table.
+
+    `source` is any callable returning the table for a base, usually a
+    `RateCache`. Rates are triangulated as `anchor[B] / anchor[A]`. A direct
+    table for A is fetched only when `tolerance` (a relative error) is set
+    and the combined rounding error of the two anchor quotes exceeds it.
+    """
+
+    def __init__(self, source=fetch_table, anchor=ANCHOR, tolerance=None):
+        self.source = source
+        self.anchor = anchor
+        self.tolerance = tolerance
+        self._rebased_from = None
+        self._rebased = {}
+        self._lock = threading.Lock()
+
+    def anchor_table(self) -> RateTable:
+        return self.source(self.anchor)
+
+    def warm(self, bases) -> dict:
+        """Load every table conversions from `bases` can need, concurrently.
+
+        That is just the anchor, plus a direct table per base when a
+        tolerance is set. Returns the `prefetch` result.
+        """
+        from .prefetch import prefetch
+
+        needed = [self.anchor]
+        if self.tolerance is not None:
+            needed += [b for b in bases if b != self.anchor]
+        return prefetch(getattr(self.source, "refresh", self.source), needed)
+
+    def needs_direct(self, from_cur: str, to_cur: str) -> bool:
+        if self.tolerance is None or self.anchor in (from_cur, to_cur):
+            return False
+        rates = self.anchor_table().rates
+        error = quote_error(rates[from_cur]) + quote_error(rates[to_cur])
+        return error > self.tolerance
+
+    def rate(self, from_cur: str, to_cur: str) -> float:
+        start = perf_counter()
+        try:
+            if from_cur == to_cur:
+                return 1.0
+            if self.needs_direct(from_cur, to_cur):
+                return float(self.source(from_cur).rates[to_cur])
+            matrix = self.anchor_table().matrix
+            i, j = matrix.id_of(from_cur), matrix.id_of(to_cur)
+            if i is None or j is None:
+                raise KeyError(from_cur if i is None else to_cur)
+            return matrix.rate(i, j)
+        finally:
+            CONVERT_SECONDS.observe(perf_counter() - start)
+
+    def quotes(self, base: str, codes) -> list:
+        """`[(code, rate)]` from `base` for each of `codes` the table quotes."""
+        matrix = self.anchor_table().matrix
+        i = matrix.id_of(base)
+        if i is None:
+            raise KeyError(base)
+        row = matrix.row(i)
+        ids = [(c, matrix.id_of(c)) for c in codes]
+        return [(c, float(row[j])) for c, j in ids if j is not None]
+
+    def convert_batch(self, amounts, from_codes, to_codes):
+        """Vectorised conversion against the anchor table (see `batch.convert_batch`)."""
+        from .batch import convert_batch
+
+        with CONVERT_SECONDS.time():
+            return convert_batch(amounts, from_codes, to_codes, self.anchor_table())
+
+    def table(self, base: str) -> RateTable:
+        """Full table for `base`, rebased from the anchor (memoised per refresh)."""
+        anchor = self.anchor_table()
+        if base == anchor.base:
+            return anchor
+        with self._lock:
+            if self._rebased_from is not anchor:
+                self._rebased_from = anchor
+                self._rebased = {}
+            rebased = self._rebased.get(base)
+        if rebased is None:
+            pivot = float(anchor.rates[base])
+            rebased = RateTable(
+                base=base,
+                rates={c: float(v) / pivot for c, v in anchor.rates.items()},
+                fetched_at=anchor.fetched_at,
+                updated_unix=anchor.updated_unix,
+                next_update_unix=anchor.next_update_unix,
+            )
+            with self._lock:
+                if self._rebased_from is anchor:
+                    self._rebased[base] = rebased
+        return rebased
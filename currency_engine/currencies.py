@@ -0,0 +1,274 @@
+import bisect
+from collections import defaultdict
+from functools import lru_cache
+
+# The most used currencies: listed first in the pickers, and the whole list
+# until a rate table says what the provider quotes.
+CURRENCIES = ["USD", "GBP", "EUR", "BDT", "INR", "JPY", "AUD", "CAD", "CNY", "SGD", "AED", "SAR"]
+
+# Quotes shown in the scrolling ticker, from the selected From currency.
+TICKER_CURRENCIES = ["GBP", "EUR", "BDT", "INR", "JPY", "AUD", "CAD", "CNY", "SGD", "AED", "SAR"]
+
+
+def build_ticker(base: str, quotes) -> str:
+    """"USD→GBP 0.7912   |   USD→EUR 0.9213" from (currency, rate) quotes."""
+    return "   |   ".join(f"{base}→{c} {rate:.4f}" for c, rate in quotes)
+
+
+# ISO 4217 names for the codes the rate providers quote.
+# Codes without an entry are still offered, under their code alone.
+CURRENCY_NAMES = {
+    "AED": "UAE Dirham",
+    "AFN": "Afghan Afghani",
+    "ALL": "Albanian Lek",
+    "AMD": "Armenian Dram",
+    "ANG": "Netherlands Antillean Guilder",
+    "AOA": "Angolan Kwanza",
+    "ARS": "Argentine Peso",
+    "AUD": "Australian Dollar",
+    "AWG": "Aruban Florin",
+    "AZN": "Azerbaijani Manat",
+    "BAM": "Bosnia-Herzegovina Convertible Mark",
+    "BBD": "Barbadian Dollar",
+    "BDT": "Bangladeshi Taka",
+    "BGN": "Bulgarian Lev",
+    "BHD": "Bahraini Dinar",
+    "BIF": "Burundian Franc",
+    "BMD": "Bermudian Dollar",
+    "BND": "Brunei Dollar",
+    "BOB": "Bolivian Boliviano",
+    "BRL": "Brazilian Real",
+    "BSD": "Bahamian Dollar",
+    "BTN": "Bhutanese Ngultrum",
+    "BWP": "Botswana Pula",
+    "BYN": "Belarusian Ruble",
+    "BZD": "Belize Dollar",
+    "CAD": "Canadian Dollar",
+    "CDF": "Congolese Franc",
+    "CHF": "Swiss Franc",
+    "CLP": "Chilean Peso",
+    "CNY": "Chinese Yuan",
+    "COP": "Colombian Peso",
+    "CRC": "Costa Rican Colón",
+    "CUP": "Cuban Peso",
+    "CVE": "Cape Verdean Escudo",
+    "CZK": "Czech Koruna",
+    "DJF": "Djiboutian Franc",
+    "DKK": "Danish Krone",
+    "DOP": "Dominican Peso",
+    "DZD": "Algerian Dinar",
+    "EGP": "Egyptian Pound",
+    "ERN": "Eritrean Nakfa",
+    "ETB": "Ethiopian Birr",
+    "EUR": "Euro",
+    "FJD": "Fijian Dollar",
+    "FKP": "Falkland Islands Pound",
+    "FOK": "Faroese Króna",
+    "GBP": "British Pound",
+    "GEL": "Georgian Lari",
+    "GGP": "Guernsey Pound",
+    "GHS": "Ghanaian Cedi",
+    "GIP": "Gibraltar Pound",
+    "GMD": "Gambian Dalasi",
+    "GNF": "Guinean Franc",
+    "GTQ": "Guatemalan Quetzal",
+    "GYD": "Guyanese Dollar",
+    "HKD": "Hong Kong Dollar",
+    "HNL": "Honduran Lempira",
+    "HRK": "Croatian Kuna",
+    "HTG": "Haitian Gourde",
+    "HUF": "Hungarian Forint",
+    "IDR": "Indonesian Rupiah",
+    "ILS": "Israeli New Shekel",
+    "IMP": "Manx Pound",
+    "INR": "Indian Rupee",
+    "IQD": "Iraqi Dinar",
+    "IRR": "Iranian Rial",
+    "ISK": "Icelandic Króna",
+    "JEP": "Jersey Pound",
+    "JMD": "Jamaican Dollar",
+    "JOD": "Jordanian Dinar",
+    "JPY": "Japanese Yen",
+    "KES": "Kenyan Shilling",
+    "KGS": "Kyrgyzstani Som",
+    "KHR": "Cambodian Riel",
+    "KID": "Kiribati Dollar",
+    "KMF": "Comorian Franc",
+    "KRW": "South Korean Won",
+    "KWD": "Kuwaiti Dinar",
+    "KYD": "Cayman Islands Dollar",
+    "KZT": "Kazakhstani Tenge",
+    "LAK": "Lao Kip",
+    "LBP": "Lebanese Pound",
+    "LKR": "Sri Lankan Rupee",
+    "LRD": "Liberian Dollar",
+    "LSL": "Lesotho Loti",
+    "LYD": "Libyan Dinar",
+    "MAD": "Moroccan Dirham",
+    "MDL": "Moldovan Leu",
+    "MGA": "Malagasy Ariary",
+    "MKD": "Macedonian Denar",
+    "MMK": "Myanmar Kyat",
+    "MNT": "Mongolian Tögrög",
+    "MOP": "Macanese Pataca",
+    "MRU": "Mauritanian Ouguiya",
+    "MUR": "Mauritian Rupee",
+    "MVR": "Maldivian Rufiyaa",
+    "MWK": "Malawian Kwacha",
+    "MXN": "Mexican Peso",
+    "MYR": "Malaysian Ringgit",
+    "MZN": "Mozambican Metical",
+    "NAD": "Namibian Dollar",
+    "NGN": "Nigerian Naira",
+    "NIO": "Nicaraguan Córdoba",
+    "NOK": "Norwegian Krone",
+    "NPR": "Nepalese Rupee",
+    "NZD": "New Zealand Dollar",
+    "OMR": "Omani Rial",
+    "PAB": "Panamanian Balboa",
+    "PEN": "Peruvian Sol",
+    "PGK": "Papua New Guinean Kina",
+    "PHP": "Philippine Peso",
+    "PKR": "Pakistani Rupee",
+    "PLN": "Polish Złoty",
+    "PYG": "Paraguayan Guaraní",
+    "QAR": "Qatari Riyal",
+    "RON": "Romanian Leu",
+    "RSD": "Serbian Dinar",
+    "RUB": "Russian Ruble",
+    "RWF": "Rwandan Franc",
+    "SAR": "Saudi Riyal",
+    "SBD": "Solomon Islands Dollar",
+    "SCR": "Seychellois Rupee",
+    "SDG": "Sudanese Pound",
+    "SEK": "Swedish Krona",
+    "SGD": "Singapore Dollar",
+    "SHP": "Saint Helena Pound",
+    "SLE": "Sierra Leonean Leone",
+    "SLL": "Sierra Leonean Leone (old)",
+    "SOS": "Somali Shilling",
+    "SRD": "Surinamese Dollar",
+    "SSP": "South Sudanese Pound",
+    "STN": "São Tomé and Príncipe Dobra",
+    "SYP": "Syrian Pound",
+    "SZL": "Swazi Lilangeni",
+    "THB": "Thai Baht",
+    "TJS": "Tajikistani Somoni",
+    "TMT": "Turkmenistani Manat",
+    "TND": "Tunisian Dinar",
+    "TOP": "Tongan Paʻanga",
+    "TRY": "Turkish Lira",
+    "TTD": "Trinidad and Tobago Dollar",
+    "TVD": "Tuvaluan Dollar",
+    "TWD": "New Taiwan Dollar",
+    "TZS": "Tanzanian Shilling",
+    "UAH": "Ukrainian Hryvnia",
+    "UGX": "Ugandan Shilling",
+    "USD": "US Dollar",
+    "UYU": "Uruguayan Peso",
+    "UZS": "Uzbekistani Som",
+    "VES": "Venezuelan Bolívar",
+    "VND": "Vietnamese Đồng",
+    "VUV": "Vanuatu Vatu",
+    "WST": "Samoan Tālā",
+    "XAF": "Central African CFA Franc",
+    "XCD": "East Caribbean Dollar",
+    "XCG": "Caribbean Guilder",
+    "XDR": "IMF Special Drawing Rights",
+    "XOF": "West African CFA Franc",
+    "XPF": "CFP Franc",
+    "YER": "Yemeni Rial",
+    "ZAR": "South African Rand",
+    "ZMW": "Zambian Kwacha",
+    "ZWL": "Zimbabwean Dollar",
+}
+
+
+def currency_label(code: str) -> str:
+    """"GBP — British Pound", or just the code when it has no known name."""
+    name = CURRENCY_NAMES.get(code)
+    return f"{code} — {name}" if name else code
+
+
+def code_of(text: str) -> str:
+    """The code a picker entry stands for: "gbp" and "GBP — British Pound" are both "GBP"."""
+    return text.strip().split(" ", 1)[0].upper()
+
+
+def currency_universe(table=None) -> list:
+    """Every code `table` quotes, the popular `CURRENCIES` first and the rest A–Z.
+
+    Without a table (nothing fetched or saved yet) it is just `CURRENCIES`.
+    """
+    if table is None:
+        return list(CURRENCIES)
+    popular = [c for c in CURRENCIES if c in table.rates]
+    return popular + sorted(set(table.rates) - set(popular))
+
+
+def _trigrams(text):
+    grams = set()
+    for word in text.split():
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class CurrencySearch:
+    """Type-ahead lookup over currency codes and names.
+
+    Prefix queries ("gb", "brit", "pound") are answered from one sorted key
+    list (the code, and the name from each word on) by binary search, so
+    they cost O(log n + matches). Other queries, substrings and typos
+    ("rupe", "doller"), fall back to a trigram index. Results keep the
+    order of `codes`, exact and prefix matches first.
+    """
+
+    def __init__(self, codes):
+        self.codes = list(codes)
+        self._rank = {c: i for i, c in enumerate(self.codes)}
+        keys = set()
+        self._grams = defaultdict(set)
+        for code in self.codes:
+            keys.add((code.lower(), code))
+            words = CURRENCY_NAMES.get(code, "").lower().split()
+            for i in range(len(words)):
+                keys.add((" ".join(words[i:]), code))
+            for gram in _trigrams(f"{code} {' '.join(words)}".lower()):
+                self._grams[gram].add(code)
+        keys = sorted(keys)
+        self._keys = [k for k, _ in keys]
+        self._key_codes = [c for _, c in keys]
+
+    def __contains__(self, code):
+        return code in self._rank
+
+    def search(self, query: str, limit=None) -> list:
+        q = " ".join(query.lower().split())
+        if not q:
+            return self.codes[:limit]
+        lo = bisect.bisect_left(self._keys, q)
+        hi = bisect.bisect_left(self._keys, q + "\uffff")
+        found = set(self._key_codes[lo:hi])
+        exact = q.upper()
+        matches = sorted(found, key=lambda c: (c != exact, not c.lower().startswith(q), self._rank[c]))
+        if len(q) >= 3 and (limit is None or len(matches) < limit):
+            grams = _trigrams(q)
+            hits = defaultdict(int)
+            for gram in grams:
+                for code in self._grams.get(gram, ()):
+                    hits[code] += 1
+            fuzzy = [c for c, n in hits.items() if c not in found and 2 * n > len(grams)]
+            fuzzy.sort(key=lambda c: (-hits[c], self._rank[c]))
+            matches += fuzzy
+        return matches[:limit]
+
+
+@lru_cache(maxsize=4)
+def _search_index(codes):
+    return CurrencySearch(codes)
+
+
+def search_index(codes) -> CurrencySearch:
+    """Shared `CurrencySearch` over `codes`, rebuilt only when the universe changes."""
+    return _search_index(tuple(codes))
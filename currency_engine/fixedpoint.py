@@ -0,0 +1,98 @@
+"""Integer minor-unit conversion with deterministic banker's rounding.
+
+Amounts are int64 counts of a currency's minor unit (cents, fils, yen).
+A pair rate is scaled to an integer: the number of target minor units per
+source minor unit, times `RATE_SCALE`. Converting is then integer multiply,
+divide and round-half-even, with no float drift in the result.
+"""
+from decimal import Decimal, InvalidOperation, ROUND_HALF_EVEN
+
+import numpy as np
+
+from .api import RateTable
+from .batch import pair_rates
+
+# ISO 4217 minor-unit exponents; everything else uses 2.
+MINOR_UNITS = {
+    "BIF": 0, "CLP": 0, "DJF": 0, "GNF": 0, "ISK": 0, "JPY": 0, "KMF": 0, "KRW": 0, "PYG": 0,
+    "RWF": 0, "UGX": 0, "UYI": 0, "VND": 0, "VUV": 0, "XAF": 0, "XOF": 0, "XPF": 0,
+    "BHD": 3, "IQD": 3, "JOD": 3, "KWD": 3, "LYD": 3, "OMR": 3, "TND": 3,
+    "CLF": 4, "UYW": 4,
+}
+
+RATE_DIGITS = 9
+RATE_SCALE = 10 ** RATE_DIGITS
+INT64_MIN, INT64_MAX = np.iinfo(np.int64).min, np.iinfo(np.int64).max
+
+
+def exponent(code: str) -> int:
+    return MINOR_UNITS.get(code, 2)
+
+
+def to_minor(text, code: str):
+    """Minor units for a decimal amount ("1,250.505" USD → 125050), or None.
+
+    Follows `parse_amount`: commas are ignored and only positive amounts
+    are accepted. Rounds half-even to the currency's exponent.
+    """
+    t = str(text or "").strip().replace(",", "")
+    try:
+        value = Decimal(t)
+    except InvalidOperation:
+        return None
+    if not value.is_finite() or value <= 0:
+        return None
+    return int(value.scaleb(exponent(code)).to_integral_value(ROUND_HALF_EVEN))
+
+
+def format_minor(minor: int, code: str) -> str:
+    """"1250.50"-style text for an amount in minor units."""
+    return f"{Decimal(int(minor)).scaleb(-exponent(code)):f}"
+
+
+def scaled_rate(rate: float, from_cur: str, to_cur: str) -> int:
+    """`rate` as target minor units per source minor unit, times RATE_SCALE."""
+    shift = RATE_DIGITS + exponent(to_cur) - exponent(from_cur)
+    return int(round(float(rate) * 10.0 ** shift))
+
+
+def convert_minor(amount: int, scaled: int) -> int:
+    """Scalar conversion: round_half_even(amount * scaled / RATE_SCALE)."""
+    q, r = divmod(int(amount) * int(scaled), RATE_SCALE)
+    if 2 * r > RATE_SCALE or (2 * r == RATE_SCALE and q % 2):
+        q += 1
+    return q
+
+
+def convert_minor_batch(amounts, scaled) -> np.ndarray:
+    """Vectorised `convert_minor` over int64 arrays, bit-for-bit identical.
+
+    `amounts * scaled` can overflow int64, so both factors are split around
+    RATE_SCALE (a = q*S + r, R = Rh*S + Rl) and the exact quotient is
+    assembled as q*R + r*Rh + (r*Rl) // S. The remainder terms always fit,
+    but q*R may not: rows with |q| >= INT64_MAX // R are settled exactly with
+    `convert_minor`, and OverflowError is raised if a result doesn't fit in
+    int64. Rates must be non-negative.
+    """
+    a, rate = np.broadcast_arrays(np.asarray(amounts, dtype=np.int64), np.asarray(scaled, dtype=np.int64))
+    q, r = np.divmod(a, RATE_SCALE)
+    rate_hi, rate_lo = np.divmod(rate, RATE_SCALE)
+    carry, rem = np.divmod(r * rate_lo, RATE_SCALE)
+    out = q * rate + r * rate_hi + carry
+    twice = 2 * rem
+    out += (twice > RATE_SCALE) | ((twice == RATE_SCALE) & (out % 2 == 1))
+    for i in np.flatnonzero(np.abs(q) >= INT64_MAX // np.maximum(rate, 1)):
+        exact = convert_minor(a.flat[i], rate.flat[i])  # near the int64 edge
+        if not INT64_MIN <= exact <= INT64_MAX:
+            raise OverflowError(f"converting {int(a.flat[i])} at {int(rate.flat[i])} overflows int64")
+        out.flat[i] = exact
+    return out
+
+
+def convert_fixed(amounts, from_codes, to_codes, table: RateTable) -> np.ndarray:
+    """Integer counterpart of `batch.convert_batch`: minor units in and out."""
+    src, dst, rates = pair_rates(from_codes, to_codes, table)
+    exponents = np.array([exponent(c) for c in table.matrix.index.codes], dtype=np.int64)
+    shift = RATE_DIGITS + exponents[dst] - exponents[src]
+    scaled = np.rint(rates * np.power(10.0, shift)).astype(np.int64)
+    return convert_minor_batch(amounts, scaled)
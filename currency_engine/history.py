@@ -0,0 +1,137 @@
+import logging
+import os
+import threading
+import time
+
+import numpy as np
+
+from .api import RateTable
+from .crossrate import ANCHOR
+
+log = logging.getLogger(__name__)
+
+DEFAULT_DIR = os.environ.get(
+    "CURRENCY_HISTORY",
+    os.path.join(os.path.expanduser("~"), ".cache", "currency-converter", "history"),
+)
+
+
+class HistoryStore:
+    """Append-only time series of anchor rates, one pair of files per currency.
+
+    `<CODE>.t` holds int64 provider update timestamps (ascending) and
+    `<CODE>.r` the matching float64 rates against `anchor`. Reads memory-map
+    the files, so an as-of lookup is a binary search that touches a handful
+    of pages and a range scan returns array views: years of history are
+    never loaded into memory.
+    """
+
+    def __init__(self, directory=DEFAULT_DIR, anchor=ANCHOR):
+        self.directory = directory
+        self.anchor = anchor
+        self._maps = {}
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    @classmethod
+    def open(cls, directory=DEFAULT_DIR, anchor=ANCHOR):
+        """The store in `directory`, or None (logged) if it can't be created there."""
+        try:
+            return cls(directory, anchor)
+        except OSError as e:
+            log.warning("rate history disabled: %s: %s", directory, e)
+            return None
+
+    def _paths(self, code):
+        base = os.path.join(self.directory, code)
+        return base + ".t", base + ".r"
+
+    def append(self, table: RateTable) -> int:
+        """Record an anchor table; returns how many currencies got a new point.
+
+        Tables in another base, or not newer than what is stored, are skipped.
+        Use it as a `RateCache.subscribe` listener.
+        """
+        if table.base != self.anchor:
+            return 0
+        stamp = int(table.updated_unix or table.fetched_at)
+        added = 0
+        with self._lock:
+            for code, rate in table.rates.items():
+                if self._append_point(code, stamp, rate):
+                    added += 1
+        return added
+
+    def _append_point(self, code, stamp, rate) -> bool:
+        """Add one point unless `stamp` is not newer than the last one.
+
+        Works on file sizes and the last 8 bytes of `.t` only, so an append
+        neither memory-maps nor keeps any file open. Both files are first cut
+        to the number of complete pairs, which drops whatever a crash
+        between (or during) the two writes left behind.
+        """
+        t_path, r_path = self._paths(code)
+        try:
+            n = min(os.path.getsize(t_path), os.path.getsize(r_path)) // 8
+        except OSError:
+            n = 0
+        with open(t_path, "ab+") as t_file, open(r_path, "ab+") as r_file:
+            t_file.truncate(n * 8)
+            r_file.truncate(n * 8)
+            if n:
+                t_file.seek((n - 1) * 8)
+                if np.frombuffer(t_file.read(8), np.int64)[0] >= stamp:
+                    return False
+            # Rate first: readers only trust points that have a timestamp
+            r_file.write(np.float64(rate).tobytes())
+            r_file.flush()
+            t_file.write(np.int64(stamp).tobytes())
+        return True
+
+    def series(self, code: str):
+        """`(times, rates)` memory-mapped arrays for `code` (empty if unknown)."""
+        t_path, r_path = self._paths(code)
+        try:
+            n = min(os.path.getsize(t_path) // 8, os.path.getsize(r_path) // 8)
+        except OSError:
+            n = 0
+        if n == 0:
+            return np.empty(0, np.int64), np.empty(0, np.float64)
+        cached = self._maps.get(code)
+        if cached is None or len(cached[0]) != n:
+            cached = (
+                np.memmap(t_path, dtype=np.int64, mode="r", shape=(n,)),
+                np.memmap(r_path, dtype=np.float64, mode="r", shape=(n,)),
+            )
+            self._maps[code] = cached
+        return cached
+
+    def as_of(self, code: str, when: float):
+        """Anchor rate for `code` in force at unix time `when`, or None."""
+        if code == self.anchor:
+            return 1.0
+        times, rates = self.series(code)
+        i = int(np.searchsorted(times, when, side="right")) - 1
+        return float(rates[i]) if i >= 0 else None
+
+    def rate_as_of(self, from_cur: str, to_cur: str, when: float):
+        """Cross rate from_cur → to_cur at unix time `when`, or None."""
+        a, b = self.as_of(from_cur, when), self.as_of(to_cur, when)
+        return b / a if a and b is not None else None
+
+    def range(self, code: str, start=0, end=None):
+        """`(times, rates)` views for `start <= t <= end`."""
+        times, rates = self.series(code)
+        lo = np.searchsorted(times, start, side="left")
+        hi = np.searchsorted(times, time.time() if end is None else end, side="right")
+        return times[lo:hi], rates[lo:hi]
+
+    def pair_range(self, from_cur: str, to_cur: str, start=0, end=None):
+        """`(times, rates)` of from_cur → to_cur, at each `to_cur` point in range."""
+        times, to_rates = self.range(to_cur, start, end)
+        if from_cur == self.anchor:
+            return times, to_rates
+        from_times, from_rates = self.series(from_cur)
+        i = np.searchsorted(from_times, times, side="right") - 1
+        known = i >= 0
+        return times[known], to_rates[known] / from_rates[i[known]]
@@ -0,0 +1,88 @@
+import threading
+from functools import cached_property
+
+import numpy as np
+
+
+class CurrencyIndex:
+    """Interns currency codes to small, stable integer ids (append-only)."""
+
+    def __init__(self, codes=()):
+        self.codes = []
+        self._ids = {}
+        self._lock = threading.Lock()
+        for code in codes:
+            self.intern(code)
+
+    def __len__(self):
+        return len(self.codes)
+
+    def intern(self, code: str) -> int:
+        i = self._ids.get(code)
+        if i is None:
+            with self._lock:
+                i = self._ids.get(code)
+                if i is None:
+                    i = self._ids[code] = len(self.codes)
+                    self.codes.append(code)
+        return i
+
+    def get(self, code: str, default=None):
+        return self._ids.get(code, default)
+
+
+# Shared by every table, so a code has the same id across refreshes.
+CURRENCY_INDEX = CurrencyIndex()
+
+
+class RateMatrix:
+    """One rate table as a contiguous float64 vector indexed by currency id.
+
+    `vector[i]` is the anchor's rate for currency id `i` (NaN where the table
+    has no quote), so `rate(i, j)` is two array reads and a divide. The full
+    N×N `cross` matrix is only built when first used.
+    """
+
+    def __init__(self, rates: dict, index=CURRENCY_INDEX):
+        self.index = index
+        ids = np.fromiter((index.intern(c) for c in rates), dtype=np.intp, count=len(rates))
+        self.vector = np.full(len(index), np.nan)
+        self.vector[ids] = np.fromiter(rates.values(), dtype=np.float64, count=len(rates))
+
+    @classmethod
+    def from_vector(cls, vector, index):
+        """Wrap an existing vector (e.g. one in shared memory) without copying it."""
+        matrix = cls.__new__(cls)
+        matrix.index = index
+        matrix.vector = vector
+        return matrix
+
+    def _padded(self, n):
+        # Codes interned after this table was built have no quote here
+        if n > len(self.vector):
+            self.vector = np.concatenate([self.vector, np.full(n - len(self.vector), np.nan)])
+            self.__dict__.pop("cross", None)
+        return self.vector
+
+    def id_of(self, code: str):
+        """Id of `code` if this table quotes it, else None."""
+        i = self.index.get(code)
+        if i is None or i >= len(self.vector) or np.isnan(self.vector[i]):
+            return None
+        return i
+
+    def rate(self, i: int, j: int) -> float:
+        return float(self.vector[j] / self.vector[i])
+
+    def rates(self, src_ids, dst_ids) -> np.ndarray:
+        vec = self._padded(len(self.index))
+        return vec[dst_ids] / vec[src_ids]
+
+    def row(self, i: int) -> np.ndarray:
+        """Rates from currency id `i` to every id."""
+        return self.vector / self.vector[i]
+
+    @cached_property
+    def cross(self) -> np.ndarray:
+        """`cross[i, j]` = rate from id `i` to id `j`."""
+        return self.vector[np.newaxis, :] / self.vector[:, np.newaxis]
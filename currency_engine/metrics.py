@@ -0,0 +1,214 @@
+"""In-process counters, histograms and gauges with Prometheus/JSON export.
+
+Recording is a dict update under a lock (well under a microsecond), so the
+hot paths stay instrumented all the time. Set CURRENCY_METRICS=0 to turn
+recording off entirely.
+
+Export either way:
+  * `render_prometheus()` - text format, served by the conversion service at
+    /metrics, or by any app with CURRENCY_METRICS_PORT set;
+  * `dump_json(path)` - written every minute (CURRENCY_METRICS_INTERVAL) by any app with
+    CURRENCY_METRICS_FILE set.
+"""
+import bisect
+import json
+import os
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+
+ENABLED = os.environ.get("CURRENCY_METRICS", "1") != "0"
+
+# Seconds; spans a cache hit (~µs) to a slow upstream fetch.
+LATENCY_BUCKETS = (1e-6, 1e-5, 1e-4, 1e-3, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+
+class Registry:
+    def __init__(self):
+        self.metrics = []
+
+    def add(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+
+REGISTRY = Registry()
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name, help, labels=(), registry=REGISTRY):
+        self.name, self.help, self.labels = name, help, labels
+        self._values = {}
+        self._lock = threading.Lock()
+        registry.add(self)
+
+    def inc(self, *label_values, amount=1):
+        if ENABLED:
+            with self._lock:
+                self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            return [(self.name, dict(zip(self.labels, k)), v) for k, v in self._values.items()]
+
+
+class Gauge:
+    """A value read at export time from `fn()`, which yields `(labels, value)` pairs."""
+
+    kind = "gauge"
+
+    def __init__(self, name, help, fn, registry=REGISTRY):
+        self.name, self.help, self.fn = name, help, fn
+        registry.add(self)
+
+    def samples(self):
+        return [(self.name, labels, value) for labels, value in self.fn()]
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, name, help, buckets=LATENCY_BUCKETS, registry=REGISTRY):
+        self.name, self.help = name, help
+        self.buckets = tuple(buckets)
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._lock = threading.Lock()
+        registry.add(self)
+
+    def observe(self, value):
+        if ENABLED:
+            i = bisect.bisect_left(self.buckets, value)
+            with self._lock:
+                self._counts[i] += 1
+                self._sum += value
+
+    @contextmanager
+    def time(self):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start)
+
+    def samples(self):
+        with self._lock:
+            counts, total = list(self._counts), self._sum
+        out, running = [], 0
+        for bound, count in zip(self.buckets + (float("inf"),), counts):
+            running += count
+            out.append((self.name + "_bucket", {"le": _fmt(bound)}, running))
+        out.append((self.name + "_sum", {}, total))
+        out.append((self.name + "_count", {}, running))
+        return out
+
+
+def _fmt(value):
+    return "+Inf" if value == float("inf") else repr(float(value))
+
+
+# ----- the metrics the engine records -----
+FETCH_SECONDS = Histogram("rates_fetch_seconds", "Upstream HTTP request latency, per attempt (no backoff)")
+PARSE_SECONDS = Histogram("rates_parse_seconds", "JSON decode and table build latency")
+CONVERT_SECONDS = Histogram("rates_convert_seconds", "Conversion latency (single or batch call)")
+CACHE_REQUESTS = Counter("rates_cache_requests_total", "Rate cache reads by outcome", ("result",))
+FETCH_ERRORS = Counter("rates_fetch_errors_total", "Failed upstream attempts (retried or not) by error type", ("type",))
+APP_ERRORS = Counter("app_errors_total", "Errors shown to users, by place and type", ("where", "type"))
+
+_caches = weakref.WeakSet()
+
+
+def track_cache(cache):
+    """Report the age of every table in `cache` through `rates_table_age_seconds`.
+
+    Caches are held weakly, so tracking never keeps one alive.
+    """
+    _caches.add(cache)
+
+
+def _table_ages():
+    now = time.time()
+    for cache in list(_caches):
+        for base, table in cache.tables().items():
+            yield {"base": base}, now - table.fetched_at
+
+
+TABLE_AGE = Gauge("rates_table_age_seconds", "Seconds since each cached table was fetched", _table_ages)
+
+
+def error_type(exc) -> str:
+    """Short label for an exception: `http_503` for API status errors, else the class name."""
+    status = getattr(exc, "status_code", None)
+    return f"http_{status}" if status else type(exc).__name__
+
+
+def record_error(where, exc):
+    APP_ERRORS.inc(where, error_type(exc))
+
+
+# ----- export -----
+def render_prometheus(registry=REGISTRY) -> str:
+    lines = []
+    for metric in registry.metrics:
+        lines.append(f"# HELP {metric.name} {metric.help}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        for name, labels, value in metric.samples():
+            label_text = ",".join(f'{k}="{v}"' for k, v in labels.items())
+            lines.append(f"{name}{{{label_text}}} {value}" if label_text else f"{name} {value}")
+    return "\n".join(lines) + "\n"
+
+
+def snapshot(registry=REGISTRY) -> dict:
+    return {
+        "timestamp": time.time(),
+        "metrics": {
+            metric.name: [{"name": n, "labels": labels, "value": v} for n, labels, v in metric.samples()]
+            for metric in registry.metrics
+        },
+    }
+
+
+def dump_json(path, registry=REGISTRY):
+    """Write `snapshot()` to `path` atomically."""
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(snapshot(registry), f)
+    os.replace(tmp, path)
+
+
+def start_exporters():
+    """Start the exporters configured by CURRENCY_METRICS_FILE / CURRENCY_METRICS_PORT."""
+    path = os.environ.get("CURRENCY_METRICS_FILE")
+    if path:
+        interval = float(os.environ.get("CURRENCY_METRICS_INTERVAL", "60"))
+
+        def dump_forever():
+            while True:
+                time.sleep(interval)
+                try:
+                    dump_json(path)
+                except OSError:
+                    pass  # unwritable right now; try again next interval
+
+        threading.Thread(target=dump_forever, name="metrics-dump", daemon=True).start()
+    port = os.environ.get("CURRENCY_METRICS_PORT")
+    if port:
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                body = render_prometheus().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer(("127.0.0.1", int(port)), MetricsHandler)
+        threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
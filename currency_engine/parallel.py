@@ -0,0 +1,135 @@
+"""Multi-process bulk conversion of one large CSV/JSONL file.
+
+The input is cut into byte ranges on line boundaries, at most `MAX_RANGE`
+bytes each. Each range goes to a process-pool worker, which streams its
+lines through the streaming command's chunk converters and writes a part
+file, so a worker holds one chunk at a time, never its whole range. The parent appends the parts to the
+output in input order as they complete. The anchor rate vector is put in
+shared memory once and every worker maps it, so nothing rate-related is
+pickled per task.
+
+Records must be one per line: CSV fields with embedded newlines are not
+supported in this mode.
+"""
+import csv
+import json
+import os
+import shutil
+import tempfile
+from multiprocessing import Pool
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+from .api import RateTable
+from .matrix import CurrencyIndex, RateMatrix
+
+# Upper bound on one job's byte range; large files get more jobs than workers.
+MAX_RANGE = 64 * 1024 * 1024
+
+_worker = {}
+
+
+def split_ranges(path, start, parts):
+    """`[(begin, end)]` byte ranges of `path` from `start`, cut after newlines."""
+    size = os.path.getsize(path)
+    bounds = [start]
+    with open(path, "rb") as f:
+        for k in range(1, parts):
+            f.seek(max(start + (size - start) * k // parts, bounds[-1]))
+            f.readline()
+            bounds.append(min(f.tell(), size))
+    bounds.append(size)
+    return [(a, b) for a, b in zip(bounds, bounds[1:]) if b > a]
+
+
+def _range_lines(f, end):
+    """Decoded lines of `f` from its position up to byte offset `end`."""
+    while f.tell() < end:
+        line = f.readline()
+        if not line:
+            return
+        yield line.decode("utf-8")
+
+
+def _init_worker(shm_name, codes, args, fieldnames):
+    from .cli import convert_chunk, convert_chunk_fixed
+
+    shm = SharedMemory(name=shm_name)
+    vector = np.ndarray((len(codes),), dtype=np.float64, buffer=shm.buf)
+    table = RateTable(base=codes[0], rates={})
+    table.__dict__["matrix"] = RateMatrix.from_vector(vector, CurrencyIndex(codes))
+    _worker.update(
+        shm=shm, table=table, args=args, fieldnames=fieldnames,
+        convert=convert_chunk_fixed if args.fixed_point else convert_chunk,
+    )
+
+
+def _convert_range(job):
+    from .cli import _chunks, _jsonl_rows
+
+    path, begin, end, part = job
+    args, fieldnames = _worker["args"], _worker["fieldnames"]
+    total = skipped = 0
+    with open(path, "rb") as f, open(part, "w", newline="", encoding="utf-8") as out:
+        f.seek(begin)
+        lines = _range_lines(f, end)
+        if fieldnames is None:
+            rows = _jsonl_rows(lines)
+        else:
+            rows = csv.DictReader(lines, fieldnames=fieldnames)
+        writer = None
+        if fieldnames is not None:
+            fields = fieldnames + [args.output_column] * (args.output_column not in fieldnames)
+            writer = csv.DictWriter(out, fieldnames=fields, extrasaction="ignore")
+        for chunk in _chunks(rows, args.chunk_size):
+            skipped += _worker["convert"](chunk, _worker["table"], args)
+            if writer is None:
+                out.writelines(json.dumps(row, ensure_ascii=False) + "\n" for row in chunk)
+            else:
+                writer.writerows(chunk)
+            total += len(chunk)
+    return part, total, skipped
+
+
+def convert_file_parallel(table, args, fmt, workers):
+    """Convert `args.input` into `args.output` with `workers` processes.
+
+    Returns `(rows, skipped)` like the sequential path.
+    """
+    fieldnames = None
+    start = 0
+    with open(args.input, "rb") as f:
+        if fmt == "csv":
+            header = f.readline()
+            start = len(header)
+            fieldnames = next(csv.reader([header.decode("utf-8-sig")]))
+
+    matrix = table.matrix
+    codes = list(matrix.index.codes[:len(matrix.vector)])
+    shm = SharedMemory(create=True, size=max(matrix.vector.nbytes, 1))
+    total = skipped = 0
+    try:
+        np.ndarray(matrix.vector.shape, dtype=np.float64, buffer=shm.buf)[:] = matrix.vector
+        size = os.path.getsize(args.input) - start
+        ranges = split_ranges(args.input, start, max(workers * 4, -(-size // MAX_RANGE)))
+        out_dir = os.path.dirname(os.path.abspath(args.output))
+        with tempfile.TemporaryDirectory(dir=out_dir) as tmp, \
+                open(args.output, "w", newline="", encoding="utf-8") as dst:
+            if fieldnames is not None:
+                fields = fieldnames + [args.output_column] * (args.output_column not in fieldnames)
+                csv.writer(dst).writerow(fields)
+            jobs = [(args.input, a, b, os.path.join(tmp, f"{i:06d}.part")) for i, (a, b) in enumerate(ranges)]
+            with Pool(workers, _init_worker, (shm.name, codes, args, fieldnames)) as pool:
+                # imap yields in input order, so parts are appended as soon as
+                # they and everything before them are done
+                for part, rows, bad in pool.imap(_convert_range, jobs):
+                    with open(part, encoding="utf-8", newline="") as src:
+                        shutil.copyfileobj(src, dst)
+                    os.remove(part)
+                    total += rows
+                    skipped += bad
+    finally:
+        shm.close()
+        shm.unlink()
+    return total, skipped
@@ -0,0 +1,25 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+
+async def prefetch_async(load, bases, concurrency=12) -> dict:
+    """Call `load(base)` for every base, at most `concurrency` at once.
+
+    `load` is typically `RateCache.refresh`. Fetches run on worker threads
+    over the shared pooled session, so a full warm costs roughly one
+    round-trip. Returns `{base: RateTable}` for the
+    bases that loaded and `{base: exception}` for those that failed.
+    """
+    loop = asyncio.get_running_loop()
+    bases = list(dict.fromkeys(bases))
+    # A pool of exactly `concurrency` threads is the concurrency limit; the
+    # default matches the pooled session's connection cap
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="prefetch") as pool:
+        jobs = [loop.run_in_executor(pool, load, b) for b in bases]
+        results = await asyncio.gather(*jobs, return_exceptions=True)
+    return dict(zip(bases, results))
+
+
+def prefetch(load, bases, concurrency=12) -> dict:
+    """Blocking wrapper around `prefetch_async` for the Tkinter and Streamlit apps."""
+    return asyncio.run(prefetch_async(load, bases, concurrency))
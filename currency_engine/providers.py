@@ -0,0 +1,101 @@
+import json
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import replace
+
+from . import transport
+from .api import API_URL, RateAPIError, RateTable, parse_table
+from .metrics import FETCH_ERRORS, PARSE_SECONDS, error_type
+
+
+class RateProvider(ABC):
+    """Where rate tables come from. Instances are usable as a `RateCache` loader."""
+
+    @abstractmethod
+    def fetch(self, base: str, previous: RateTable = None) -> RateTable:
+        """The latest table for `base`; `previous` allows a conditional fetch."""
+
+    def __call__(self, base, previous=None):
+        return self.fetch(base, previous)
+
+
+class OpenERAPIProvider(RateProvider):
+    """open.er-api.com, or anything speaking its format (see `stubserver`)."""
+
+    def __init__(self, url=API_URL):
+        self.url = url
+
+    def fetch(self, base, previous=None):
+        """Fetch the latest table for `base`.
+
+        With a `previous` table that carries validators the request is
+        conditional; a 304 answer returns `previous` marked as just fetched.
+        """
+        headers = {}
+        if previous is not None:
+            if previous.etag:
+                headers["If-None-Match"] = previous.etag
+            if previous.last_modified:
+                headers["If-Modified-Since"] = previous.last_modified
+        res = transport.get(self.url.format(base), headers=headers)  # counts its own failed attempts
+        try:
+            if res.status_code == 304 and previous is not None:
+                return replace(previous, fetched_at=time.time())
+            if res.status_code != 200:
+                raise RateAPIError(f"API returned {res.status_code}", res.status_code)
+            with PARSE_SECONDS.time():
+                return parse_table(base, res.json(), res.headers.get("ETag"), res.headers.get("Last-Modified"))
+        except Exception as e:
+            if res.status_code < 400:  # HTTP errors were counted by transport.get
+                FETCH_ERRORS.inc(error_type(e))
+            raise
+
+
+class FileProvider(RateProvider):
+    """Tables read from `<directory>/<BASE>.json` files in open.er-api format."""
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def fetch(self, base, previous=None):
+        path = os.path.join(self.directory, f"{base}.json")
+        try:
+            with PARSE_SECONDS.time():
+                try:
+                    with open(path, encoding="utf-8") as f:
+                        data = json.load(f)
+                except FileNotFoundError:
+                    raise RateAPIError(f"no rates file {path}", 404)
+                return parse_table(base, data)
+        except Exception as e:
+            FETCH_ERRORS.inc(error_type(e))
+            raise
+
+
+def provider_from_env(value=None) -> RateProvider:
+    """Provider named by CURRENCY_PROVIDER.
+
+    Unset means open.er-api; `file:<dir>` a FileProvider; anything else is
+    taken as an open.er-api style URL template with `{}` for the base.
+    """
+    value = os.environ.get("CURRENCY_PROVIDER", "") if value is None else value
+    if not value:
+        return OpenERAPIProvider()
+    if value.startswith("file:"):
+        return FileProvider(value[len("file:"):])
+    return OpenERAPIProvider(value)
+
+
+_default = None
+_default_lock = threading.Lock()
+
+
+def default_provider() -> RateProvider:
+    global _default
+    if _default is None:
+        with _default_lock:
+            if _default is None:
+                _default = provider_from_env()
+    return _default
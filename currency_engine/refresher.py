@@ -0,0 +1,44 @@
+import threading
+
+from .schedule import refresh_delay
+
+
+class BackgroundRefresher:
+    """Daemon thread that keeps an engine's tables warm.
+
+    It warms `bases` immediately, then sleeps until `lead` seconds before the
+    earliest loaded table goes stale for the engine's `RateCache` (the
+    provider's announced next update, or the cache's `ttl` for tables
+    without one) and warms again. Readers therefore always find a fresh
+    table and never start a revalidation fetch of their own. Keep `lead`
+    below `schedule.GRACE`, so a scheduled refetch still lands after the
+    provider's update. After a failed round it retries sooner, after
+    `retry` seconds.
+    """
+
+    def __init__(self, engine, bases, lead=60, retry=30):
+        self.engine = engine
+        self.bases = list(bases)
+        self.lead = lead
+        self.retry = retry
+        self.ttl = getattr(engine.source, "ttl", 300)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="rate-refresher", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def next_delay(self, results) -> float:
+        if any(isinstance(r, Exception) for r in results.values()):
+            return self.retry
+        due = min(refresh_delay(t, fallback=self.ttl) for t in results.values())
+        return max(due - self.lead, self.retry)
+
+    def _run(self):
+        delay = 0
+        while not self._stop.wait(delay):
+            delay = self.next_delay(self.engine.warm(self.bases))
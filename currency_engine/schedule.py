@@ -0,0 +1,21 @@
+import time
+
+# open.er-api publishes about once a day and says when in every response.
+GRACE = 120  # seconds to wait past the announced update before refetching
+MIN_INTERVAL = 300  # never refetch one table more often than this
+MAX_INTERVAL = 24 * 3600  # ...or less often than this
+
+
+def refresh_delay(table, now=None, fallback=300) -> float:
+    """Seconds until `table` is worth refetching (<= 0 means now).
+
+    Uses the provider's `next_update_unix` when the table has one, otherwise
+    `fallback` seconds after it was fetched. A provider that is late with
+    its update is polled every MIN_INTERVAL rather than continuously.
+    """
+    now = time.time() if now is None else now
+    age = now - table.fetched_at
+    if not table.next_update_unix:
+        return fallback - age
+    due = max(table.next_update_unix + GRACE - now, MIN_INTERVAL - age)
+    return min(due, MAX_INTERVAL - age)
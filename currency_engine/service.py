@@ -0,0 +1,217 @@
+"""Local JSON conversion service on asyncio streams (HTTP/1.1, keep-alive).
+
+    GET  /convert?amount=100&from=USD&to=GBP
+    POST /convert/batch   {"amounts": [...], "from": "USD" | [...], "to": "GBP" | [...]}
+    GET  /rates?base=USD
+    GET  /currencies?q=pound   codes and names, type-ahead filtered by `q`
+    GET  /health
+    GET  /metrics         Prometheus text format (see `metrics`)
+
+Conversions read the shared `RateCache` only; a `BackgroundRefresher` keeps
+it current, so no request ever waits on the upstream API.
+"""
+import asyncio
+import json
+from numbers import Real
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+
+from .amounts import parse_amount
+from .cache import RateCache
+from .crossrate import CrossRateEngine
+from .currencies import CURRENCIES, CURRENCY_NAMES, currency_universe, search_index
+from .metrics import CACHE_REQUESTS, record_error, render_prometheus
+from .refresher import BackgroundRefresher
+from .snapshot import SnapshotStore
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           413: "Payload Too Large", 503: "Service Unavailable"}
+MAX_BODY = 64 * 1024 * 1024
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class ConversionService:
+    def __init__(self, engine: CrossRateEngine):
+        self.engine = engine
+        self.routes = {
+            ("GET", "/convert"): self.convert,
+            ("POST", "/convert/batch"): self.convert_batch,
+            ("GET", "/rates"): self.rates,
+            ("GET", "/currencies"): self.currencies,
+            ("GET", "/health"): self.health,
+            ("GET", "/metrics"): self.metrics,
+        }
+
+    # ----- handlers: (query, body) -> JSON-able, or str for text/plain -----
+    def convert(self, query, body):
+        amount = parse_amount(_param(query, "amount"))
+        if amount is None:
+            raise HTTPError(400, "amount must be a positive number")
+        from_cur, to_cur = _param(query, "from"), _param(query, "to")
+        if not (from_cur and to_cur):
+            raise HTTPError(400, "from and to are required")
+        self._check_codes([from_cur, to_cur])  # before rate()'s same-code shortcut
+        rate = self._lookup(self.engine.rate, from_cur, to_cur)
+        return {"amount": amount, "from": from_cur, "to": to_cur, "rate": rate, "result": amount * rate}
+
+    def convert_batch(self, query, body):
+        try:
+            req = json.loads(body)
+            amounts, from_codes, to_codes = req["amounts"], req["from"], req["to"]
+        except (ValueError, KeyError, TypeError):
+            raise HTTPError(400, 'expected {"amounts": [...], "from": ..., "to": ...}')
+        if not isinstance(amounts, list) or not all(
+            isinstance(a, Real) and not isinstance(a, bool) for a in amounts
+        ):
+            raise HTTPError(400, "amounts must be a list of numbers")
+        try:
+            values = np.array(amounts, dtype=np.float64)
+        except OverflowError:  # an integer too large for a float
+            values = None
+        if values is None or not np.isfinite(values).all():
+            raise HTTPError(400, "amounts must be finite")
+        for name, codes in (("from", from_codes), ("to", to_codes)):
+            if isinstance(codes, str):
+                continue
+            if not isinstance(codes, list) or not all(isinstance(c, str) for c in codes):
+                raise HTTPError(400, f"{name} must be a currency code or a list of them")
+            if len(codes) != len(amounts):
+                raise HTTPError(400, f"{name} has {len(codes)} codes for {len(amounts)} amounts")
+        results = self._lookup(self.engine.convert_batch, values, from_codes, to_codes)
+        return {"results": results.tolist()}
+
+    def rates(self, query, body):
+        base = _param(query, "base", self.engine.anchor)
+        table = self._lookup(self.engine.table, base)
+        return {"base": table.base, "updated_unix": table.updated_unix, "rates": table.rates}
+
+    def currencies(self, query, body):
+        codes = currency_universe(self.engine.anchor_table())
+        q = _param(query, "q")
+        if q:
+            codes = search_index(codes).search(q)
+        return {"currencies": [{"code": c, "name": CURRENCY_NAMES.get(c)} for c in codes]}
+
+    def health(self, query, body):
+        table = self.engine.anchor_table()
+        return {"status": "ok", "rates_age": round(table.age(), 1)}
+
+    def metrics(self, query, body):
+        return render_prometheus()
+
+    def _check_codes(self, codes):
+        matrix = self.engine.anchor_table().matrix
+        unknown = [c for c in codes if matrix.id_of(c) is None]
+        if unknown:
+            raise HTTPError(400, f"unknown currency: {', '.join(unknown)}")
+
+    @staticmethod
+    def _lookup(fn, *args):
+        try:
+            return fn(*args)
+        except KeyError as e:
+            raise HTTPError(400, f"unknown currency: {e.args[0]}")
+        except ValueError as e:
+            raise HTTPError(400, str(e))
+
+    # ----- HTTP plumbing -----
+    def dispatch(self, method, target, body):
+        url = urlsplit(target)
+        handler = self.routes.get((method, url.path))
+        if handler is None:
+            status = 405 if any(path == url.path for _, path in self.routes) else 404
+            raise HTTPError(status, REASONS[status])
+        return handler(parse_qs(url.query), body)
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                    return
+                version, headers = "HTTP/1.0", {}  # a head that doesn't parse is answered, then closed
+                try:
+                    method, target, version, headers, length = _parse_head(head)
+                    if length > MAX_BODY:
+                        raise HTTPError(413, REASONS[413])
+                    body = await reader.readexactly(length) if length else b""
+                    status, payload = 200, self.dispatch(method, target, body)
+                except HTTPError as e:
+                    status, payload = e.status, {"error": str(e)}
+                except Exception as e:  # rates not loaded yet, upstream down at cold start, ...
+                    record_error("service", e)
+                    status, payload = 503, {"error": f"{type(e).__name__}: {e}"}
+
+                keep_alive = (
+                    headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+                    and status != 413  # the unread body is still in the stream
+                )
+                if isinstance(payload, str):
+                    data, content_type = payload.encode(), "text/plain; version=0.0.4"
+                else:
+                    data, content_type = json.dumps(payload, separators=(",", ":")).encode(), "application/json"
+                writer.write(
+                    f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+                    f"Content-Type: {content_type}\r\nContent-Length: {len(data)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode() + data
+                )
+                await writer.drain()
+                if not keep_alive:
+                    return
+        finally:
+            writer.close()
+
+
+def cached_only(cache):
+    """Table source for the request path: whatever is cached, never a fetch."""
+    def source(base):
+        table = cache.peek(base)
+        if table is None:
+            CACHE_REQUESTS.inc("miss")
+            raise LookupError(f"no {base} rates loaded yet")
+        CACHE_REQUESTS.inc("hit")
+        return table
+    return source
+
+
+def build_engine():
+    """Request-path engine over a snapshot-backed cache kept fresh in the background."""
+    cache = RateCache(snapshot=SnapshotStore.open())
+    BackgroundRefresher(CrossRateEngine(cache), CURRENCIES).start()
+    return CrossRateEngine(cached_only(cache))
+
+
+def _parse_head(head: bytes):
+    """`(method, target, version, headers, content_length)`; HTTPError 400 if malformed."""
+    lines = head.decode("latin-1").split("\r\n")
+    try:
+        method, target, version = lines[0].split(" ", 2)
+        headers = {}
+        for line in lines[1:]:
+            if ":" in line:
+                k, v = line.split(":", 1)
+                headers[k.strip().lower()] = v.strip()
+        length = int(headers.get("content-length") or 0)
+    except ValueError:
+        raise HTTPError(400, "malformed request")
+    if length < 0:
+        raise HTTPError(400, "malformed request")
+    return method, target, version, headers, length
+
+
+def _param(query, name, default=""):
+    return query.get(name, [default])[0]
+
+
+async def serve(host="127.0.0.1", port=8080, engine=None):
+    service = ConversionService(engine or build_engine())
+    server = await asyncio.start_server(service.handle, host, port, limit=MAX_BODY)
+    async with server:
+        await server.serve_forever()
@@ -0,0 +1,114 @@
+import json
+import logging
+import os
+import sqlite3
+
+from .api import RateTable
+
+log = logging.getLogger(__name__)
+
+DEFAULT_PATH = os.environ.get(
+    "CURRENCY_SNAPSHOT",
+    os.path.join(os.path.expanduser("~"), ".cache", "currency-converter", "rates.sqlite3"),
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    base TEXT PRIMARY KEY,
+    fetched_at REAL NOT NULL,
+    updated_unix INTEGER,
+    next_update_unix INTEGER,
+    rates TEXT NOT NULL,
+    etag TEXT,
+    last_modified TEXT
+)
+"""
+COLUMNS = "base, fetched_at, updated_unix, next_update_unix, rates, etag, last_modified"
+
+
+class SnapshotStore:
+    """Last good rate table per base, kept in a small SQLite file.
+
+    Each save replaces one row inside a single transaction, so readers (other
+    processes included) always see either the old table or the new one. The
+    database runs in WAL mode so a save never blocks a concurrent load.
+    """
+
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        conn = self._connect()
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(SCHEMA)
+            # Snapshots written before HTTP validators were stored
+            have = {row[1] for row in conn.execute("PRAGMA table_info(snapshots)")}
+            for column in ("etag", "last_modified"):
+                if column not in have:
+                    conn.execute(f"ALTER TABLE snapshots ADD COLUMN {column} TEXT")
+            conn.commit()
+        finally:
+            conn.close()
+
+    @classmethod
+    def open(cls, path=DEFAULT_PATH):
+        """The store at `path`, or None (logged) if it can't be created there.
+
+        A read-only or missing home directory then costs the snapshot, not
+        the app: callers run with `snapshot=None`.
+        """
+        try:
+            return cls(path)
+        except (OSError, sqlite3.Error) as e:
+            log.warning("rate snapshot disabled: %s: %s", path, e)
+            return None
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=5)
+
+    def save(self, table: RateTable):
+        row = (
+            table.base,
+            table.fetched_at,
+            table.updated_unix,
+            table.next_update_unix,
+            json.dumps(table.rates, separators=(",", ":")),
+            table.etag,
+            table.last_modified,
+        )
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute(f"INSERT OR REPLACE INTO snapshots ({COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?)", row)
+        finally:
+            conn.close()
+
+    def load(self, base: str):
+        """Stored table for `base`, or None."""
+        conn = self._connect()
+        try:
+            row = conn.execute(f"SELECT {COLUMNS} FROM snapshots WHERE base = ?", (base,)).fetchone()
+        finally:
+            conn.close()
+        return _to_table(row) if row else None
+
+    def load_all(self) -> dict:
+        conn = self._connect()
+        try:
+            rows = conn.execute(f"SELECT {COLUMNS} FROM snapshots").fetchall()
+        finally:
+            conn.close()
+        return {row[0]: _to_table(row) for row in rows}
+
+
+def _to_table(row) -> RateTable:
+    base, fetched_at, updated_unix, next_update_unix, rates, etag, last_modified = row
+    return RateTable(
+        base=base,
+        rates=json.loads(rates),
+        fetched_at=fetched_at,
+        updated_unix=updated_unix,
+        next_update_unix=next_update_unix,
+        etag=etag,
+        last_modified=last_modified,
+    )
@@ -0,0 +1,101 @@
+"""Local stand-in for the open.er-api endpoint, for offline tests and benchmarks.
+
+Serves `GET /v6/latest/<BASE>` in the provider's JSON format from a fixed USD
+table (rebased per request), with optional injected latency and errors, and
+ETag / 304 support. Point the apps at it with
+
+    CURRENCY_PROVIDER=http://127.0.0.1:8081/v6/latest/{}
+"""
+import json
+import random
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Realistic USD-based rates for the currencies the apps offer.
+STUB_RATES = {
+    "USD": 1.0, "GBP": 0.7912, "EUR": 0.9213, "BDT": 109.72, "INR": 83.12, "JPY": 151.23,
+    "AUD": 1.5214, "CAD": 1.3621, "CNY": 7.2341, "SGD": 1.3478, "AED": 3.6725, "SAR": 3.75,
+}
+
+
+class StubRatesServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address=("127.0.0.1", 0), rates=None, latency=0.0, jitter=0.0,
+                 error_rate=0.0, error_status=503, update_every=86400):
+        super().__init__(address, _Handler)
+        self.rates = dict(rates or STUB_RATES)
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.update_every = update_every
+        self.requests = 0
+        self.not_modified = 0
+        self._lock = threading.Lock()
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/v6/latest/{{}}"
+
+    def payload(self, base):
+        pivot = self.rates[base]
+        now = int(time.time())
+        last = now - now % self.update_every
+        return {
+            "result": "success",
+            "base_code": base,
+            "time_last_update_unix": last,
+            "time_next_update_unix": last + self.update_every,
+            "rates": {code: rate / pivot for code, rate in self.rates.items()},
+        }
+
+    def start(self):
+        """Serve on a daemon thread; returns self."""
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        # Headers and body go out in separate writes; don't let Nagle hold the body
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def do_GET(self):
+        server = self.server
+        with server._lock:
+            server.requests += 1
+        delay = server.latency + random.uniform(0, server.jitter)
+        if delay:
+            time.sleep(delay)
+        if random.random() < server.error_rate:
+            return self._send(server.error_status, b"")
+
+        base = self.path.rstrip("/").rsplit("/", 1)[-1].upper()
+        if base not in server.rates:
+            return self._send(200, json.dumps({"result": "error", "error-type": "unsupported-code"}).encode())
+        data = server.payload(base)
+        etag = f'"{base}-{data["time_last_update_unix"]}"'
+        if self.headers.get("If-None-Match") == etag:
+            with server._lock:
+                server.not_modified += 1
+            return self._send(304, b"", etag)
+        self._send(200, json.dumps(data).encode(), etag)
+
+    def _send(self, status, body, etag=None):
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        if etag:
+            self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
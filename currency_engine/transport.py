@@ -0,0 +1,68 @@
+import random
+import threading
+import time
+
+from .metrics import FETCH_ERRORS, FETCH_SECONDS, error_type
+
+# requests (and urllib3, certifi, ...) is imported by the first fetch, not at
+# import time: the apps start from the snapshot without touching the network.
+
+HEADERS = {"User-Agent": "Mozilla/5.0"}
+
+# Statuses worth another try: rate limiting and transient upstream failures.
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def session() -> "requests.Session":
+    """The process-wide keep-alive session shared by every fetch."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+
+                s = requests.Session()
+                # pool_block caps open sockets per host instead of bursting past the pool
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=12, pool_block=True)
+                s.mount("https://", adapter)
+                s.mount("http://", adapter)
+                s.headers.update(HEADERS)
+                _session = s
+    return _session
+
+
+def backoff_delay(attempt: int, base=0.25, cap=4.0) -> float:
+    """Full-jitter exponential backoff: uniform in [0, min(cap, base * 2**attempt)]."""
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+def get(url: str, timeout=15, retries=2, **kwargs) -> "requests.Response":
+    """GET through the pooled session, retrying connection errors, timeouts
+    and `RETRY_STATUSES` with jittered backoff.
+
+    The last response (or exception) is returned (or raised) once the
+    retries are used up. Every attempt is timed in `rates_fetch_seconds`
+    (backoff sleeps excluded), and every failed one, retried or not, is
+    counted in `rates_fetch_errors_total`.
+    """
+    from requests import ConnectionError, Timeout
+
+    for attempt in range(retries + 1):
+        try:
+            with FETCH_SECONDS.time():
+                res = session().get(url, timeout=timeout, **kwargs)
+        except Exception as e:
+            FETCH_ERRORS.inc(error_type(e))
+            if attempt == retries or not isinstance(e, (ConnectionError, Timeout)):
+                raise
+        else:
+            if res.status_code >= 400:
+                FETCH_ERRORS.inc(f"http_{res.status_code}")
+            if res.status_code not in RETRY_STATUSES or attempt == retries:
+                return res
+            res.close()
+        time.sleep(backoff_delay(attempt))
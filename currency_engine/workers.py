@@ -0,0 +1,48 @@
+import queue
+import threading
+
+
+class LatestTaskPool:
+    """A fixed set of worker threads where only the newest task per lane counts.
+
+    Submitting to a lane supersedes whatever is still pending there: at most
+    one task per lane waits in the queue, so memory stays bounded however
+    fast tasks arrive. Every submit returns a generation token; a result is
+    still wanted only while `is_current(lane, token)` holds, which lets the
+    caller drop results of superseded tasks that were already running.
+    """
+
+    def __init__(self, workers=2, name="worker"):
+        self._pending = {}
+        self._generations = {}
+        self._ready = queue.Queue()
+        self._lock = threading.Lock()
+        for i in range(workers):
+            threading.Thread(target=self._run, name=f"{name}-{i}", daemon=True).start()
+
+    def submit(self, lane, fn, *args) -> int:
+        """Queue `fn(token, *args)` on `lane`, cancelling the lane's pending task."""
+        with self._lock:
+            token = self._generations.get(lane, 0) + 1
+            self._generations[lane] = token
+            queued = lane in self._pending
+            self._pending[lane] = (token, fn, args)
+        if not queued:
+            self._ready.put(lane)
+        return token
+
+    def is_current(self, lane, token) -> bool:
+        return self._generations.get(lane) == token
+
+    def _run(self):
+        while True:
+            lane = self._ready.get()
+            with self._lock:
+                task = self._pending.pop(lane, None)
+            if task is None:
+                continue
+            token, fn, args = task
+            try:
+                fn(token, *args)
+            except Exception:
+                pass  # tasks report their own errors; keep the worker alive
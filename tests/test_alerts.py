@@ -0,0 +1,79 @@
+import random
+
+from currency_engine.alerts import ABOVE, BELOW, AlertEngine
+from currency_engine.api import RateTable
+
+CODES = ["USD", "GBP", "EUR", "INR", "JPY"]
+
+
+def _table(rates):
+    return RateTable("USD", dict(rates, USD=1.0))
+
+
+def _brute_force(rules, old, new):
+    """Ids of the rules a move from `old` to `new` pair rates crosses."""
+    fired = []
+    for rule in rules:
+        pair = (rule.from_cur, rule.to_cur)
+        before, after = old[pair], new[pair]
+        if rule.direction == ABOVE and before < rule.threshold <= after:
+            fired.append(rule.id)
+        if rule.direction == BELOW and after <= rule.threshold < before:
+            fired.append(rule.id)
+    return sorted(fired)
+
+
+def test_check_matches_brute_force():
+    rng = random.Random(3)
+    engine = AlertEngine()
+    rules = [
+        engine.add(*rng.sample(CODES, 2), rng.uniform(0.01, 200), rng.choice([ABOVE, BELOW]))
+        for _ in range(3000)
+    ]
+    for rule in rng.sample(rules, 300):
+        engine.remove(rule.id)
+        rules.remove(rule)
+
+    old = None
+    for _ in range(100):
+        rates = {c: rng.uniform(0.5, 150) for c in CODES if c != "USD"}
+        table = _table(rates)
+        fired = sorted(alert.id for alert, _ in engine.check(table))
+        new = {(a, b): table.rates[b] / table.rates[a] for a in CODES for b in CODES}
+        assert fired == (_brute_force(rules, old, new) if old else [])
+        old = new
+
+
+def test_rising_and_falling_crossings():
+    fired = []
+    engine = AlertEngine(notify=lambda alert, rate: fired.append(alert.id))
+    up = engine.add("USD", "GBP", 0.80, ABOVE)
+    down = engine.add("USD", "GBP", 0.78, BELOW)
+
+    engine.check(_table({"GBP": 0.79}))  # baseline only
+    engine.check(_table({"GBP": 0.80}))  # rising onto the threshold fires
+    engine.check(_table({"GBP": 0.81}))  # staying above doesn't
+    assert fired == [up.id]
+
+    engine.check(_table({"GBP": 0.78}))  # falling onto the threshold fires
+    engine.check(_table({"GBP": 0.70}))
+    assert fired == [up.id, down.id]
+
+
+def test_rule_added_between_checks_uses_previous_table():
+    engine = AlertEngine()
+    engine.check(_table({"GBP": 0.79}))
+    alert = engine.add("USD", "GBP", 0.80, ABOVE)
+    assert engine.check(_table({"GBP": 0.81})) == [(alert, 0.81)]
+
+
+def test_reload_picks_up_file_changes(tmp_path):
+    path = str(tmp_path / "alerts.json")
+    engine = AlertEngine.load(path)
+    engine.check(_table({"GBP": 0.79}))
+
+    writer = AlertEngine.load(path)
+    alert = writer.add("USD", "GBP", 0.80, ABOVE)
+    writer.save()
+
+    assert engine.check(_table({"GBP": 0.81})) == [(alert, 0.81)]
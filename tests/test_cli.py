@@ -0,0 +1,33 @@
+import io
+from types import SimpleNamespace
+
+import pytest
+
+from currency_engine.api import RateTable
+from currency_engine.cli import _read_rows, convert_chunk, convert_chunk_fixed
+
+TABLE = RateTable("USD", {"USD": 1.0, "GBP": 0.79, "EUR": 0.92})
+ARGS = SimpleNamespace(
+    amount_column="amount", from_column=None, from_code="USD", to_column="cur", to_code=None,
+    output_column="converted", decimals=2,
+)
+
+JSONL = """{"amount": "10", "cur": "GBP"}
+{"amount": "10", "cur
+[1, 2]
+
+{"amount": "5", "cur": ["USD"]}
+{"amount": "1", "cur": "EUR"}
+"""
+
+
+@pytest.mark.parametrize("convert, good", [
+    (convert_chunk, [7.9, 0.92]),
+    (convert_chunk_fixed, ["7.90", "0.92"]),
+])
+def test_bad_jsonl_lines_are_skipped(convert, good):
+    rows, _ = _read_rows(io.StringIO(JSONL), "jsonl")
+    rows = list(rows)
+    assert len(rows) == 5
+    assert convert(rows, TABLE, ARGS) == 3
+    assert [row["converted"] for row in rows] == [good[0], "", "", "", good[1]]
@@ -0,0 +1,37 @@
+from currency_engine.currencies import CURRENCY_NAMES, CurrencySearch
+
+CODES = ["USD", "EUR", "GBP", "INR", "PKR", "AUD", "CAD", "EGP"]
+
+
+def test_prefix_matches_code_and_name_words():
+    search = CurrencySearch(CODES)
+    assert search.search("gb") == ["GBP"]
+    assert search.search("Brit") == ["GBP"]
+    assert search.search("  british   pound ") == ["GBP"]
+    # every word of the name is a prefix key; results keep the universe order
+    assert search.search("pound") == ["GBP", "EGP"]
+
+
+def test_exact_code_ranks_first():
+    search = CurrencySearch(["AUD", "USD"])
+    assert search.search("usd")[0] == "USD"
+
+
+def test_fuzzy_substrings_and_typos():
+    search = CurrencySearch(CODES)
+    assert search.search("rupe") == ["INR", "PKR"]
+    assert "USD" in search.search("doller")
+    assert search.search("zzzz") == []
+
+
+def test_empty_query_and_limit():
+    search = CurrencySearch(CODES)
+    assert search.search("") == CODES
+    assert search.search("", limit=3) == CODES[:3]
+    assert len(search.search("dollar", limit=2)) == 2
+    assert "GBP" in search and "XYZ" not in search
+
+
+def test_every_code_finds_itself():
+    search = CurrencySearch(sorted(CURRENCY_NAMES))
+    assert all(search.search(code)[0] == code for code in CURRENCY_NAMES)
@@ -0,0 +1,50 @@
+import random
+from decimal import Decimal, ROUND_HALF_EVEN
+
+import numpy as np
+import pytest
+
+from currency_engine.fixedpoint import INT64_MAX, RATE_SCALE, convert_minor, convert_minor_batch
+
+
+def test_convert_minor_rounds_half_even():
+    half = RATE_SCALE // 2
+    # 0.5 → 0, 1.5 → 2, 2.5 → 2, just over half → up
+    assert [convert_minor(n, half) for n in (1, 3, 5)] == [0, 2, 2]
+    assert convert_minor(1, half + 1) == 1
+    assert convert_minor(-3, half) == -2
+
+
+def test_convert_minor_matches_decimal():
+    rng = random.Random(7)
+    for _ in range(2000):
+        amount, scaled = rng.randrange(10 ** 12), rng.randrange(1, 10 ** 13)
+        exact = (Decimal(amount) * scaled / RATE_SCALE).quantize(Decimal(1), ROUND_HALF_EVEN)
+        assert convert_minor(amount, scaled) == int(exact)
+
+
+def test_batch_matches_scalar():
+    rng = np.random.default_rng(7)
+    amounts = rng.integers(-10 ** 12, 10 ** 12, 20000)
+    scaled = rng.integers(0, 10 ** 14, 20000)
+    expected = [convert_minor(a, r) for a, r in zip(amounts.tolist(), scaled.tolist())]
+    assert convert_minor_batch(amounts, scaled).tolist() == expected
+
+
+def test_batch_matches_scalar_on_ties():
+    half = RATE_SCALE // 2
+    amounts = np.arange(-50, 50)
+    expected = [convert_minor(a, half) for a in amounts.tolist()]
+    assert convert_minor_batch(amounts, half).tolist() == expected
+
+
+def test_batch_near_int64_limit_is_exact():
+    amounts = [INT64_MAX, INT64_MAX - 1, INT64_MAX // 2]
+    scaled = [RATE_SCALE, RATE_SCALE, 2 * RATE_SCALE - 1]
+    expected = [convert_minor(a, r) for a, r in zip(amounts, scaled)]
+    assert convert_minor_batch(amounts, scaled).tolist() == expected
+
+
+def test_batch_overflow_raises():
+    with pytest.raises(OverflowError):
+        convert_minor_batch([1, INT64_MAX // 2], [RATE_SCALE, 3 * RATE_SCALE])
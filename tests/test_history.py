@@ -0,0 +1,49 @@
+import os
+
+import numpy as np
+import pytest
+
+from currency_engine.api import RateTable
+from currency_engine.history import HistoryStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = HistoryStore(str(tmp_path))
+    for stamp, gbp, eur in [(100, 0.80, 0.90), (200, 0.82, 0.91), (300, 0.78, 0.95)]:
+        store.append(RateTable("USD", {"USD": 1.0, "GBP": gbp, "EUR": eur}, updated_unix=stamp))
+    return store
+
+
+def test_append_skips_old_and_foreign_tables(store):
+    assert store.append(RateTable("USD", {"GBP": 0.5}, updated_unix=300)) == 0
+    assert store.append(RateTable("EUR", {"GBP": 0.5}, updated_unix=400)) == 0
+    assert store.series("GBP")[0].tolist() == [100, 200, 300]
+
+
+def test_as_of(store):
+    assert store.as_of("GBP", 99) is None
+    assert store.as_of("GBP", 100) == 0.80
+    assert store.as_of("GBP", 250) == 0.82
+    assert store.as_of("GBP", 10 ** 10) == 0.78
+    assert store.as_of("USD", 0) == 1.0
+    assert store.as_of("XXX", 250) is None
+    assert store.rate_as_of("GBP", "EUR", 200) == pytest.approx(0.91 / 0.82)
+
+
+def test_pair_range(store):
+    times, rates = store.pair_range("USD", "GBP", 150, 300)
+    assert times.tolist() == [200, 300]
+    assert rates.tolist() == [0.82, 0.78]
+
+    times, rates = store.pair_range("GBP", "EUR")
+    assert times.tolist() == [100, 200, 300]
+    np.testing.assert_allclose(rates, [0.90 / 0.80, 0.91 / 0.82, 0.95 / 0.78])
+
+
+def test_torn_append_is_dropped(store, tmp_path):
+    with open(os.path.join(str(tmp_path), "GBP.r"), "ab") as f:
+        f.write(np.float64(0.5).tobytes())  # a rate whose timestamp never got written
+    assert store.as_of("GBP", 10 ** 10) == 0.78
+    store.append(RateTable("USD", {"GBP": 0.77}, updated_unix=400))
+    assert store.series("GBP")[1].tolist() == [0.80, 0.82, 0.78, 0.77]
@@ -0,0 +1,36 @@
+import time
+
+import pytest
+
+from currency_engine.api import RateTable
+from currency_engine.cache import RateCache
+from currency_engine.crossrate import CrossRateEngine
+from currency_engine.refresher import BackgroundRefresher
+from currency_engine.schedule import GRACE, refresh_delay
+
+
+def _refresher(ttl=300):
+    cache = RateCache(loader=None, ttl=ttl)
+    return BackgroundRefresher(CrossRateEngine(cache), ["USD"], lead=60), cache
+
+
+def test_refreshes_ahead_of_the_cache_ttl():
+    refresher, cache = _refresher(ttl=300)
+    table = RateTable("USD", {"USD": 1.0})
+    delay = refresher.next_delay({"USD": table})
+    assert delay == pytest.approx(240, abs=1)
+    assert refresh_delay(table, now=table.fetched_at + delay, fallback=cache.ttl) > 0
+
+
+def test_refreshes_ahead_of_the_provider_update():
+    refresher, cache = _refresher()
+    now = time.time()
+    table = RateTable("USD", {"USD": 1.0}, fetched_at=now, next_update_unix=int(now) + 3600)
+    delay = refresher.next_delay({"USD": table})
+    assert 3600 < delay < 3600 + GRACE  # after the update, before readers see it stale
+    assert refresh_delay(table, now=now + delay, fallback=cache.ttl) > 0
+
+
+def test_retries_after_a_failure():
+    refresher, _ = _refresher()
+    assert refresher.next_delay({"USD": OSError("down")}) == refresher.retry
@@ -0,0 +1,88 @@
+import asyncio
+import json
+
+import pytest
+
+from currency_engine.api import RateTable
+from currency_engine.crossrate import CrossRateEngine
+from currency_engine.service import ConversionService, HTTPError
+
+TABLE = RateTable("USD", {"USD": 1.0, "GBP": 0.79, "EUR": 0.92, "JPY": 150.0})
+
+
+@pytest.fixture
+def service():
+    return ConversionService(CrossRateEngine(lambda base: TABLE))
+
+
+def _status(service, method, target, body=b""):
+    try:
+        service.dispatch(method, target, body)
+    except HTTPError as e:
+        return e.status
+    return 200
+
+
+def _batch(service, **req):
+    return service.dispatch("POST", "/convert/batch", json.dumps(req).encode())
+
+
+def test_convert(service):
+    out = service.dispatch("GET", "/convert?amount=10&from=USD&to=GBP", b"")
+    assert out["result"] == pytest.approx(7.9)
+    assert service.dispatch("GET", "/convert?amount=10&from=GBP&to=GBP", b"")["rate"] == 1.0
+
+
+@pytest.mark.parametrize("query", [
+    "amount=5", "amount=5&from=USD", "amount=x&from=USD&to=GBP", "amount=5&from=USD&to=XYZ",
+    "amount=5&from=XYZ&to=XYZ",
+])
+def test_convert_rejects_bad_params(service, query):
+    assert _status(service, "GET", f"/convert?{query}") == 400
+
+
+def test_convert_batch(service):
+    out = _batch(service, amounts=[1, 2], **{"from": "USD", "to": ["GBP", "EUR"]})
+    assert out["results"] == pytest.approx([0.79, 1.84])
+    assert _batch(service, amounts=[], **{"from": "USD", "to": "GBP"})["results"] == []
+
+
+@pytest.mark.parametrize("body", [
+    b"not json",
+    b'{"amounts": [1]}',
+    b'{"amounts": {"a": 1}, "from": "USD", "to": "GBP"}',
+    b'{"amounts": [1, null, 2], "from": "USD", "to": "GBP"}',
+    b'{"amounts": ["1"], "from": "USD", "to": "GBP"}',
+    b'{"amounts": [1, NaN], "from": "USD", "to": "GBP"}',
+    b'{"amounts": [1e400], "from": "USD", "to": "GBP"}',
+    b'{"amounts": [1, 2], "from": ["USD"], "to": "GBP"}',
+    b'{"amounts": [1], "from": [1], "to": "GBP"}',
+    b'{"amounts": [1], "from": "USD", "to": "XYZ"}',
+])
+def test_convert_batch_rejects_bad_input(service, body):
+    assert _status(service, "POST", "/convert/batch", body) == 400
+
+
+def test_routes(service):
+    assert _status(service, "GET", "/nowhere") == 404
+    assert _status(service, "POST", "/convert") == 405
+    assert service.dispatch("GET", "/rates?base=GBP", b"")["rates"]["USD"] == pytest.approx(1 / 0.79)
+    codes = [c["code"] for c in service.dispatch("GET", "/currencies?q=pound", b"")["currencies"]]
+    assert codes == ["GBP"]
+
+
+def test_http_round_trip(service):
+    async def exchange(raw):
+        server = await asyncio.start_server(service.handle, "127.0.0.1", 0)
+        async with server:
+            reader, writer = await asyncio.open_connection(*server.sockets[0].getsockname()[:2])
+            writer.write(raw)
+            await writer.drain()
+            response = await reader.read()
+            writer.close()
+            return response
+
+    ok = asyncio.run(exchange(b"GET /convert?amount=2&from=USD&to=JPY HTTP/1.0\r\n\r\n"))
+    assert ok.startswith(b"HTTP/1.1 200 ") and json.loads(ok.split(b"\r\n\r\n", 1)[1])["result"] == 300.0
+    bad = asyncio.run(exchange(b"POST /convert/batch HTTP/1.1\r\nContent-Length: nope\r\n\r\n"))
+    assert bad.startswith(b"HTTP/1.1 400 ")
@@ -0,0 +1,36 @@
+import pytest
+
+from currency_engine import transport
+from currency_engine.api import RateAPIError
+from currency_engine.metrics import FETCH_ERRORS, FETCH_SECONDS
+from currency_engine.providers import OpenERAPIProvider
+from currency_engine.stubserver import StubRatesServer
+
+
+def _sample(metric, name, **labels):
+    return sum(v for n, l, v in metric.samples() if n == name and l == labels)
+
+
+@pytest.fixture
+def stub(monkeypatch):
+    monkeypatch.setattr(transport, "backoff_delay", lambda attempt: 0)
+    server = StubRatesServer().start()
+    yield server
+    server.shutdown()
+
+
+def test_every_failed_attempt_is_counted(stub):
+    stub.error_rate = 1.0
+    errors = _sample(FETCH_ERRORS, "rates_fetch_errors_total", type="http_503")
+    attempts = _sample(FETCH_SECONDS, "rates_fetch_seconds_count")
+    with pytest.raises(RateAPIError):
+        OpenERAPIProvider(stub.url).fetch("USD")
+    # the first try and both retries, each counted and timed once
+    assert _sample(FETCH_ERRORS, "rates_fetch_errors_total", type="http_503") - errors == 3
+    assert _sample(FETCH_SECONDS, "rates_fetch_seconds_count") - attempts == 3
+
+
+def test_a_success_counts_no_errors(stub):
+    errors = sum(v for _, _, v in FETCH_ERRORS.samples())
+    assert OpenERAPIProvider(stub.url).fetch("USD").rates["GBP"] == pytest.approx(0.7912)
+    assert sum(v for _, _, v in FETCH_ERRORS.samples()) == errors
@@ -1,18 +1,140 @@
-import tkinter as tk
-from tkinter import ttk, messagebox
-import requests
-import threading
-
-API_URL = "https://open.er-api.com/v6/latest/{}"
+import time
+
+STARTED = time.perf_counter()  # startup phases are timed from here
+
+import tkinter as tk  # noqa: E402
+from tkinter import ttk, messagebox  # noqa: E402
+import tkinter.font as tkfont  # noqa: E402
+import logging  # noqa: E402
+import os  # noqa: E402
+import sys  # noqa: E402
+import threading  # noqa: E402
+from collections import deque  # noqa: E402
+
+# The shared engine lives one level up, next to web_app.py.
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Only light modules here: numpy (history, rate matrix) and requests load
+# on the warm-up thread while the window is being built.
+from currency_engine import (  # noqa: E402
+    AlertEngine, CURRENCIES, TICKER_CURRENCIES, CrossRateEngine, LatestTaskPool, RateAPIError, RateCache,
+    SnapshotStore, build_ticker, code_of, currency_label, currency_universe, record_error, search_index,
+    start_exporters,
+)
+from currency_engine.schedule import MIN_INTERVAL, refresh_delay  # noqa: E402
+
+log = logging.getLogger("currency_converter")
+
+
+class StartupTimer:
+    """Logs each startup phase (ms since STARTED) as it completes.
+
+    The window is interactive once it is shown and the rates are ready;
+    that moment is logged as `interactive`. Set CURRENCY_LOG_LEVEL=INFO to
+    see the breakdown.
+    """
+
+    def __init__(self, started=STARTED):
+        self.started = started
+        self._waiting = {"window shown", "rates ready"}
+        self._lock = threading.Lock()
+
+    def mark(self, phase):
+        elapsed = (time.perf_counter() - self.started) * 1000
+        log.info("startup: %-14s %7.1f ms", phase, elapsed)
+        with self._lock:
+            done = phase in self._waiting
+            self._waiting.discard(phase)
+            done = done and not self._waiting
+        if done:
+            log.info("startup: %-14s %7.1f ms", "interactive", elapsed)
+
+
+class TickerBar:
+    """Scroll one pre-rendered Canvas text item right to left by pixel offset.
+
+    Each frame is a single `canvas.move`, so the text is never rebuilt or
+    relaid out. Frames are spaced `frame_ms` apart and advance by elapsed
+    time, so a late frame doesn't slow the scroll. Animation stops while the
+    window is unmapped (minimised) and resumes when it is shown again.
+    """
+
+    def __init__(self, parent, text, font, bg, fg, speed=60, frame_ms=33):
+        self.speed = speed  # pixels per second
+        self.frame_ms = frame_ms
+        height = tkfont.Font(font=font).metrics("linespace") + 16
+        self.canvas = tk.Canvas(parent, height=height, width=300, bg=bg, highlightthickness=0, bd=0)
+        self.item = self.canvas.create_text(0, height // 2, text=text, font=font, fill=fg, anchor="w")
+        self._job = None
+        self._last = None
+
+        top = self.canvas.winfo_toplevel()
+        top.bind("<Map>", lambda e: e.widget is top and self.resume(), add="+")
+        top.bind("<Unmap>", lambda e: e.widget is top and self.pause(), add="+")
+
+    def pack(self, **kwargs):
+        self.canvas.pack(**kwargs)
+        self.resume()
+
+    def set_text(self, text):
+        self.canvas.itemconfigure(self.item, text=text)
+
+    def pause(self):
+        if self._job is not None:
+            self.canvas.after_cancel(self._job)
+            self._job = None
+
+    def resume(self):
+        if self._job is None:
+            self._last = time.monotonic()
+            self._job = self.canvas.after(self.frame_ms, self._frame)
+
+    def _frame(self):
+        now = time.monotonic()
+        dx = self.speed * (now - self._last)
+        self._last = now
+        self.canvas.move(self.item, -dx, 0)
+        x1, _, x2, _ = self.canvas.bbox(self.item)
+        if x2 < 0:  # fully scrolled off the left edge: wrap to the right
+            self.canvas.move(self.item, self.canvas.winfo_width() - x1, 0)
+        self._job = self.canvas.after(self.frame_ms, self._frame)
 
 
 class CurrencyConverterApp:
     def __init__(self, root):
+        self.startup = StartupTimer()
+        self.startup.mark("imports")
         self.root = root
         self.root.title("Currency Converter Pro")
         self.root.resizable(False, False)
         self.root.configure(bg="#0f172a")
 
+        # One cached anchor table serves every From/To pair, for both
+        # Convert and the ticker; stale tables are refreshed in the background.
+        # The on-disk snapshot makes the very first conversion instant too.
+        # Refreshes follow the provider's next-update time; the 5 minutes are
+        # only a fallback for responses that don't announce one.
+        self.auto_refresh_minutes = 5
+        self.rates = RateCache(ttl=self.auto_refresh_minutes * 60, snapshot=SnapshotStore.open())
+        self.engine = CrossRateEngine(self.rates)
+
+        # Threshold alerts (`python -m currency_engine alert add ...`) are
+        # checked against every fresh table; the snapshot sets the baseline.
+        self.alerts = AlertEngine.load(notify=self.on_alert)
+        self._fired = deque()  # (alert, rate) from fetch threads, shown on the UI thread
+        self._loop_running = False
+
+        # Two fixed workers: a new conversion (or ticker fetch) cancels the
+        # pending one, and results from superseded ones are dropped
+        self.workers = LatestTaskPool(workers=2)
+
+        # Warm up while the widgets are built: heavy imports, the snapshot's
+        # rate matrix, then every table the pickers can need from the network
+        self._rates_ready = threading.Event()
+        self._rates_warm = threading.Event()
+        threading.Thread(target=self._prepare_rates, name="warm-up", daemon=True).start()
+        self.startup.mark("engine")
+
         # ----- ttk style -----
         style = ttk.Style()
         style.theme_use("clam")
@@ -24,7 +146,7 @@ class CurrencyConverterApp:
         style.configure("TCombobox", font=("Segoe UI", 11))
         style.map(
             "TCombobox",
-            fieldbackground=[("readonly", "white")],
+            fieldbackground=[("readonly", "white"), ("!disabled", "white")],
             background=[("readonly", "white")],
             foreground=[("readonly", "black")]
         )
@@ -43,21 +165,15 @@ class CurrencyConverterApp:
         self.ticker_frame = tk.Frame(main, bg="#0b1220")
         self.ticker_frame.pack(fill="x", pady=(0, 16))
 
-        self.ticker_label = tk.Label(
+        # Scrolls on its own (paused while minimised); just set the text
+        self.ticker = TickerBar(
             self.ticker_frame,
-            text="Loading live rates ticker...",
+            text="   Loading live rates ticker...   ",
             font=("Segoe UI", 10, "bold"),
             bg="#0b1220",
-            fg="#38bdf8",
-            anchor="w"
+            fg="#38bdf8"
         )
-        self.ticker_label.pack(fill="x", padx=10, pady=8)
-
-        self.ticker_text = "   Loading live rates ticker...   "
-        self.ticker_running = True
-
-        # Start scrolling animation
-        self.animate_ticker()
+        self.ticker.pack(fill="x", padx=10)
 
         # ----- Card -----
         card = tk.Frame(main, bg="#111827", bd=0, highlightthickness=0)
@@ -87,8 +203,13 @@ class CurrencyConverterApp:
         self.from_var = tk.StringVar()
         self.to_var = tk.StringVar()
 
-        self.from_combo = ttk.Combobox(card, textvariable=self.from_var, state="readonly")
-        self.to_combo = ttk.Combobox(card, textvariable=self.to_var, state="readonly")
+        # Editable: typing a code or name filters the list (see filter_currencies)
+        self.from_combo = ttk.Combobox(card, textvariable=self.from_var, width=26)
+        self.to_combo = ttk.Combobox(card, textvariable=self.to_var, width=26)
+        for combo in (self.from_combo, self.to_combo):
+            combo.bind("<KeyRelease>", self.filter_currencies)
+            combo.bind("<<ComboboxSelected>>", self.settle_currency)
+            combo.bind("<FocusOut>", self.settle_currency)
 
         self.from_combo.grid(row=3, column=0, sticky="ew", padx=14, pady=(0, 16))
         self.to_combo.grid(row=3, column=2, sticky="ew", padx=14, pady=(0, 16))
@@ -177,83 +298,186 @@ class CurrencyConverterApp:
         self.root.bind("<Return>", lambda e: self.convert_thread())
         self.amount_entry.focus()
 
+        self.startup.mark("widgets")
+
         # ✅ Auto-fit window to content
         self.root.update_idletasks()
         w = main.winfo_reqwidth() + 36
         h = main.winfo_reqheight() + 36
         self.root.geometry(f"{w}x{h}")
+        self.root.after_idle(lambda: self.startup.mark("window shown"))
 
-        # ✅ Start ticker fetching + auto refresh every 5 minutes
-        self.auto_refresh_minutes = 5
-        self.start_ticker_fetch()
+        # ✅ Show the ticker once rates are ready (again once warm);
+        # refresh whenever the provider publishes new rates
+        self.root.after(0, self._watch_warm_up)
         self.schedule_ticker_refresh()
 
     # ---------------------------
     # TICKER FUNCTIONS
     # ---------------------------
-    def animate_ticker(self):
-        """Scroll ticker text from right to left by rotating characters."""
-        if self.ticker_running and self.ticker_text:
-            self.ticker_text = self.ticker_text[1:] + self.ticker_text[0]
-            self.ticker_label.config(text=self.ticker_text)
-        self.root.after(70, self.animate_ticker)  # speed (lower = faster)
-
-    def build_ticker_text(self, base, rates):
-        """Build ticker string from selected currencies."""
-        show = ["GBP", "EUR", "BDT", "INR", "JPY", "AUD", "CAD", "CNY", "SGD", "AED", "SAR"]
-        parts = []
-        for c in show:
-            if c in rates:
-                parts.append(f"{base}→{c} {rates[c]:.4f}")
-        return "   |   ".join(parts)
+    def build_ticker_text(self, base, quotes):
+        """Build ticker string from (currency, rate) quotes."""
+        return build_ticker(base, quotes)
 
     def set_ticker_text(self, txt):
-        self.ticker_text = "   LIVE RATES   |   " + txt + "   |   "
+        self.ticker.set_text("   LIVE RATES   |   " + txt + "   |   ")
+
+    def post(self, lane, token, fn):
+        """Run `fn` on the UI thread unless a newer task on `lane` superseded it."""
+        self.root.after(0, lambda: self.workers.is_current(lane, token) and fn())
 
     def start_ticker_fetch(self):
-        threading.Thread(target=self.fetch_ticker_rates, daemon=True).start()
+        base = self.resolve_code(self.from_var.get())
+        self.workers.submit("ticker", self.fetch_ticker_rates, base)
 
-    def fetch_ticker_rates(self):
+    def fetch_ticker_rates(self, token, base):
         """Fetch rates for ticker based on current FROM currency."""
         try:
-            base = self.from_var.get().strip() or "USD"
-            headers = {"User-Agent": "Mozilla/5.0"}
-            res = requests.get(API_URL.format(base), headers=headers, timeout=15)
-
-            if res.status_code != 200:
-                self.root.after(0, lambda: self.set_ticker_text("Ticker API blocked / network issue"))
-                return
-
-            data = res.json()
-            if data.get("result") != "success":
-                self.root.after(0, lambda: self.set_ticker_text("Ticker error: could not load rates"))
-                return
+            quotes = self.engine.quotes(base, TICKER_CURRENCIES)
+            txt = self.build_ticker_text(base, quotes)
+
+            self.post("ticker", token, lambda: self.set_ticker_text(txt))
+
+        except RateAPIError as e:
+            record_error("ticker", e)
+            if e.status_code is not None:
+                self.post("ticker", token, lambda: self.set_ticker_text("Ticker API blocked / network issue"))
+            else:
+                self.post("ticker", token, lambda: self.set_ticker_text("Ticker error: could not load rates"))
+
+        except Exception as e:
+            record_error("ticker", e)
+            self.post("ticker", token, lambda: self.set_ticker_text("Ticker error: network problem"))
+
+    def on_alert(self, alert, rate):
+        """Called from a fetch thread when a watched pair crosses a threshold.
+
+        Alerts are queued; until the main loop runs (the warm-up fetch can
+        fire them first) they wait for `_watch_warm_up` to show them.
+        """
+        self._fired.append((alert, rate))
+        if self._loop_running:
+            self.root.after(0, self._show_alerts)
+
+    def _show_alerts(self):
+        while self._fired:
+            alert, rate = self._fired.popleft()
+            self.root.bell()
+            self.set_status(f"🔔 {alert} (now {rate:.6f})")
+
+    def refresh_due_in(self):
+        """Seconds until the anchor table is due (provider-aware), 0 if missing."""
+        table = self.rates.peek(self.engine.anchor)
+        if table is None:
+            return 0
+        return refresh_delay(table, fallback=self.auto_refresh_minutes * 60)
 
-            rates = data.get("rates", {})
-            txt = self.build_ticker_text(base, rates)
+    def schedule_ticker_refresh(self):
+        """Wake up when the provider publishes new rates (checked at most every MIN_INTERVAL)."""
+        delay = max(self.refresh_due_in(), MIN_INTERVAL)
+        self.root.after(int(delay * 1000), self._refresh_ticker)
 
-            self.root.after(0, lambda: self.set_ticker_text(txt))
+    def _prepare_rates(self):
+        """Startup work on its own thread, overlapping widget construction.
 
+        It must not touch Tk: the main loop isn't running yet, and alerts it
+        fires are queued by `on_alert`. Both events are set however it ends;
+        `_watch_warm_up` follows them from the UI thread.
+        """
+        try:
+            from currency_engine import HistoryStore  # numpy
+
+            history = HistoryStore.open()
+            if history is not None:
+                self.rates.subscribe(history.append)
+            self.rates.subscribe(self.alerts.check)
+            saved = self.rates.peek(self.engine.anchor)
+            if saved is not None:
+                saved.matrix  # built now rather than by the first conversion
+                self.alerts.check(saved)
+                self.startup.mark("rates ready")
+                self._rates_ready.set()
+            # warm() never raises: prefetch hands back each base's exception
+            failed = {b: r for b, r in self.engine.warm(CURRENCIES).items() if isinstance(r, Exception)}
+            if failed:
+                log.warning("startup: network warm-up failed: %s", "; ".join(f"{b}: {e}" for b, e in failed.items()))
+            else:
+                self.startup.mark("network warm")
+                if saved is None:
+                    self.startup.mark("rates ready")
         except Exception:
-            self.root.after(0, lambda: self.set_ticker_text("Ticker error: network problem"))
-
-    def schedule_ticker_refresh(self):
-        """Auto refresh ticker every X minutes."""
-        self.root.after(self.auto_refresh_minutes * 60 * 1000, self._refresh_ticker)
+            log.exception("startup: rate warm-up failed")
+        finally:
+            self._rates_ready.set()
+            self._rates_warm.set()
+
+    def _watch_warm_up(self, ticker_shown=False):
+        """Follow the warm-up thread from the UI thread; no pool worker waits on it.
+
+        The ticker shows the snapshot's rates as soon as they are ready, and
+        the warm ones (plus the full currency list) once the fetch is done.
+        """
+        self._loop_running = True
+        self._show_alerts()
+        if self._rates_warm.is_set():
+            self.load_currencies()
+            if self.rates.peek(self.engine.anchor) is None:  # offline with no snapshot
+                self.set_ticker_text("Ticker error: could not load rates")
+            else:
+                self.start_ticker_fetch()
+            return
+        if self._rates_ready.is_set() and not ticker_shown:
+            ticker_shown = True
+            self.start_ticker_fetch()
+        self.root.after(50, self._watch_warm_up, ticker_shown)
 
     def _refresh_ticker(self):
-        self.start_ticker_fetch()
+        if self.refresh_due_in() <= 0:
+            base = self.resolve_code(self.from_var.get())
+            self.workers.submit("ticker", self._refresh_rates, base)
         self.schedule_ticker_refresh()
 
+    def _refresh_rates(self, token, base):
+        try:
+            self.rates.refresh(self.engine.anchor)
+        except Exception:
+            pass  # the ticker fetch below reports the failure
+        self.fetch_ticker_rates(token, base)
+
     # ---------------------------
     # MAIN APP FUNCTIONS
     # ---------------------------
     def load_currencies(self):
-        currencies = ["USD", "GBP", "EUR", "BDT", "INR", "JPY", "AUD", "CAD", "CNY", "SGD", "AED", "SAR"]
-        self.from_combo["values"] = currencies
-        self.to_combo["values"] = currencies
-        self.from_combo.set("USD")
-        self.to_combo.set("GBP")
+        """Offer every currency the cached rate table quotes (the popular ones until one loads)."""
+        self.universe = currency_universe(self.rates.peek(self.engine.anchor))
+        self.search = search_index(self.universe)
+        self.labels = [currency_label(c) for c in self.universe]
+        for combo, var, default in ((self.from_combo, self.from_var, "USD"), (self.to_combo, self.to_var, "GBP")):
+            combo["values"] = self.labels
+            if self.root.focus_get() is not combo:  # don't rewrite what the user is typing
+                combo.set(currency_label(self.resolve_code(var.get()) if var.get() else default))
+
+    def resolve_code(self, text):
+        """The code a picker's text stands for: the code typed or shown, else the best match."""
+        code = code_of(text) if text.strip() else "USD"
+        if code in self.search:
+            return code
+        matches = self.search.search(text, 1)
+        return matches[0] if matches else code
+
+    def filter_currencies(self, event):
+        """Type-ahead: narrow the dropdown to codes/names matching the text."""
+        if event.keysym in ("Up", "Down", "Left", "Right", "Return", "Escape", "Tab"):
+            return
+        text = event.widget.get()
+        matches = self.search.search(text) if text.strip() else self.universe
+        event.widget["values"] = [currency_label(c) for c in matches] or self.labels
+
+    def settle_currency(self, event):
+        """Replace partial text with the matching entry and restore the full list."""
+        combo = event.widget
+        combo.set(currency_label(self.resolve_code(combo.get())))
+        combo["values"] = self.labels
 
     def set_status(self, msg):
         self.status_label.config(text=f"Status: {msg}")
@@ -274,56 +498,67 @@ class CurrencyConverterApp:
         self.amount_entry.focus()
 
     def convert_thread(self):
-        threading.Thread(target=self.convert, daemon=True).start()
-
-    def convert(self):
         amount_text = self.amount_var.get().strip()
-        from_cur = self.from_var.get().strip()
-        to_cur = self.to_var.get().strip()
+        from_cur = self.resolve_code(self.from_var.get())
+        to_cur = self.resolve_code(self.to_var.get())
+        self.workers.submit("convert", self.convert, amount_text, from_cur, to_cur)
 
+    def convert(self, token, amount_text, from_cur, to_cur):
         try:
             amount = float(amount_text)
             if amount <= 0:
                 raise ValueError
-        except:
-            self.root.after(0, lambda: messagebox.showerror("Invalid Input", "Enter a valid positive number."))
+        except ValueError:  # a typo, not an error: the web app doesn't count these either
+            self.post("convert", token, lambda: messagebox.showerror("Invalid Input", "Enter a valid positive number."))
+            return
+
+        unknown = [c for c in (from_cur, to_cur) if c not in self.search]
+        if unknown:  # typed text that matches no currency
+            msg = f"No rates for {unknown[0]}."
+            self.post("convert", token, lambda: messagebox.showerror("Unknown Currency", msg))
+            self.post("convert", token, lambda: self.set_status("Unknown currency ❌"))
             return
 
         if from_cur == to_cur:
-            self.root.after(0, lambda: self.result_label.config(text=f"Result: {amount:,.2f} {to_cur}"))
-            self.root.after(0, lambda: self.rate_label.config(text=f"Rate: 1 {from_cur} = 1 {to_cur}"))
-            self.root.after(0, lambda: self.set_status("Done ✅"))
+            self.post("convert", token, lambda: self.result_label.config(text=f"Result: {amount:,.2f} {to_cur}"))
+            self.post("convert", token, lambda: self.rate_label.config(text=f"Rate: 1 {from_cur} = 1 {to_cur}"))
+            self.post("convert", token, lambda: self.set_status("Done ✅"))
             return
 
         try:
-            self.root.after(0, lambda: self.set_status("Fetching live rates..."))
-            headers = {"User-Agent": "Mozilla/5.0"}
-            res = requests.get(API_URL.format(from_cur), headers=headers, timeout=15)
-
-            if res.status_code != 200:
-                self.root.after(0, lambda: messagebox.showerror("API Error", f"API returned {res.status_code}"))
-                self.root.after(0, lambda: self.set_status("API failed ❌"))
-                return
-
-            data = res.json()
-            if data.get("result") != "success":
-                self.root.after(0, lambda: messagebox.showerror("API Error", "Could not fetch live rates."))
-                self.root.after(0, lambda: self.set_status("API error ❌"))
-                return
-
-            rate = float(data["rates"][to_cur])
+            self.post("convert", token, lambda: self.set_status("Fetching live rates..."))
+            rate = self.engine.rate(from_cur, to_cur)
             converted = amount * rate
 
-            self.root.after(0, lambda: self.result_label.config(text=f"Result: {converted:,.2f} {to_cur}"))
-            self.root.after(0, lambda: self.rate_label.config(text=f"Rate: 1 {from_cur} = {rate:.6f} {to_cur}"))
-            self.root.after(0, lambda: self.set_status("Done ✅"))
+            self.post("convert", token, lambda: self.result_label.config(text=f"Result: {converted:,.2f} {to_cur}"))
+            self.post("convert", token, lambda: self.rate_label.config(text=f"Rate: 1 {from_cur} = {rate:.6f} {to_cur}"))
+            self.post("convert", token, lambda: self.set_status("Done ✅"))
 
-        except Exception:
-            self.root.after(0, lambda: messagebox.showerror("Network Error", "Internet/API blocked. Try again."))
-            self.root.after(0, lambda: self.set_status("Network error ❌"))
+        except KeyError as e:  # typed a code the provider doesn't quote
+            record_error("convert", e)
+            msg = f"No rates for {e.args[0]}."
+            self.post("convert", token, lambda: messagebox.showerror("Unknown Currency", msg))
+            self.post("convert", token, lambda: self.set_status("Unknown currency ❌"))
+
+        except RateAPIError as e:
+            record_error("convert", e)
+            msg = str(e)
+            if e.status_code is not None:
+                self.post("convert", token, lambda: messagebox.showerror("API Error", msg))
+                self.post("convert", token, lambda: self.set_status("API failed ❌"))
+            else:
+                self.post("convert", token, lambda: messagebox.showerror("API Error", "Could not fetch live rates."))
+                self.post("convert", token, lambda: self.set_status("API error ❌"))
+
+        except Exception as e:
+            record_error("convert", e)
+            self.post("convert", token, lambda: messagebox.showerror("Network Error", "Internet/API blocked. Try again."))
+            self.post("convert", token, lambda: self.set_status("Network error ❌"))
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=os.environ.get("CURRENCY_LOG_LEVEL", "WARNING"), format="%(message)s")
+    start_exporters()  # CURRENCY_METRICS_FILE / CURRENCY_METRICS_PORT, if set
     root = tk.Tk()
     app = CurrencyConverterApp(root)
     root.mainloop()
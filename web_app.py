@@ -1,7 +1,12 @@
-import requests
+from collections import deque
+from itertools import count
+
 import streamlit as st
 
-API_URL = "https://open.er-api.com/v6/latest/{}"
+from currency_engine import (
+    AlertEngine, CURRENCIES, TICKER_CURRENCIES, BackgroundRefresher, CrossRateEngine, HistoryStore, RateCache, SnapshotStore,
+    build_ticker, currency_label, currency_universe, parse_amount, record_error, start_exporters,
+)
 
 st.set_page_config(page_title="Currency Converter Pro", page_icon="💱", layout="centered")
 
@@ -135,35 +140,57 @@ div[data-testid="stButton"] > button:has(span:contains("Refresh")){
 # -----------------------------
 # Helpers
 # -----------------------------
-@st.cache_data(ttl=300)
-def fetch_rates(base: str) -> dict:
-    headers = {"User-Agent": "Mozilla/5.0"}
-    r = requests.get(API_URL.format(base), headers=headers, timeout=15)
-    r.raise_for_status()
-    data = r.json()
-    if data.get("result") != "success":
-        raise RuntimeError("API did not return success")
-    return data.get("rates", {})
-
-def parse_amount(text: str):
-    t = (text or "").strip().replace(",", "")
-    if not t:
-        return None
-    try:
-        v = float(t)
-        return v if v > 0 else None
-    except:
-        return None
-
-def build_ticker(base: str, rates: dict) -> str:
-    show = ["GBP","EUR","BDT","INR","JPY","AUD","CAD","CNY","SGD","AED","SAR"]
-    parts = [f"{base}→{c} {rates[c]:.4f}" for c in show if c in rates]
-    return "   |   ".join(parts) if parts else "Ticker: no rates"
+@st.cache_resource
+def alert_log() -> deque:
+    """Recent alerts fired by background refreshes, as (number, text).
+
+    Shared by every session; each one toasts the numbers it hasn't seen yet.
+    """
+    return deque(maxlen=50)
+
+# One process-wide rate store shared by every session and rerun. Reads hand
+# back the cached table objects themselves (no pickling or copying), and a
+# background thread re-warms them as soon as the provider publishes new
+# rates (it announces when), so no rerun ever waits on the API. The cache is
+# seeded from the on-disk snapshot, so a cold worker (even an offline one)
+# converts immediately.
+@st.cache_resource
+def rate_store() -> CrossRateEngine:
+    cache = RateCache(ttl=300, snapshot=SnapshotStore.open())
+    history = HistoryStore.open()
+    if history is not None:
+        cache.subscribe(history.append)  # every fresh table extends the history
+    store = CrossRateEngine(source=cache)
+    # threshold alerts (`python -m currency_engine alert add ...`), baseline from the snapshot
+    log, numbers = alert_log(), count(1)
+
+    def notify(alert, rate):
+        log.append((next(numbers), f"🔔 {alert} (now {rate:.6f})"))
+
+    alerts = AlertEngine.load(notify=notify)
+    cache.subscribe(alerts.check)
+    saved = cache.peek(store.anchor)
+    if saved is not None:
+        alerts.check(saved)
+    BackgroundRefresher(store, CURRENCIES).start()
+    start_exporters()  # CURRENCY_METRICS_FILE / CURRENCY_METRICS_PORT, if set
+    return store
+
+engine = rate_store()
+fired_alerts = list(alert_log())
+newest = fired_alerts[-1][0] if fired_alerts else 0
+seen = st.session_state.setdefault("alerts_seen", newest)  # a new session starts caught up
+for number, text in fired_alerts:
+    if number > seen:
+        st.toast(text)
+st.session_state["alerts_seen"] = newest
 
 # -----------------------------
 # State
 # -----------------------------
-currencies = ["USD","GBP","EUR","BDT","INR","JPY","AUD","CAD","CNY","SGD","AED","SAR"]
+# Every currency the cached table quotes; the pickers' built-in type-ahead
+# matches names too, through the "GBP — British Pound" labels
+currencies = currency_universe(engine.source.peek(engine.anchor))
 st.session_state.setdefault("from_cur","USD")
 st.session_state.setdefault("to_cur","GBP")
 st.session_state.setdefault("result_text","Result: --")
@@ -178,9 +205,11 @@ st.markdown('<div class="sub">Live rates • Swap • Clear • Rate display</di
 
 # Ticker
 try:
-    ticker_rates = fetch_rates(st.session_state["from_cur"])
-    ticker_text = "LIVE RATES   |   " + build_ticker(st.session_state["from_cur"], ticker_rates) + "   |   "
-except Exception:
+    ticker_quotes = engine.quotes(st.session_state["from_cur"], TICKER_CURRENCIES)
+    ticker_text = build_ticker(st.session_state["from_cur"], ticker_quotes) or "Ticker: no rates"
+    ticker_text = "LIVE RATES   |   " + ticker_text + "   |   "
+except Exception as e:
+    record_error("ticker", e)
     ticker_text = "Ticker error: network/API blocked"
 
 st.markdown(f'<div class="ticker-wrap"><div class="ticker">{ticker_text}</div></div>', unsafe_allow_html=True)
@@ -192,12 +221,12 @@ amount_text = st.text_input("Amount", value="", placeholder="e.g., 100")
 
 c1, c2, c3 = st.columns([1, 0.45, 1])
 with c1:
-    from_cur = st.selectbox("From", currencies, index=currencies.index(st.session_state["from_cur"]))
+    from_cur = st.selectbox("From", currencies, index=currencies.index(st.session_state["from_cur"]), format_func=currency_label)
 with c2:
     st.markdown("<br>", unsafe_allow_html=True)
     swap_clicked = st.button("⇄ Swap", use_container_width=True)
 with c3:
-    to_cur = st.selectbox("To", currencies, index=currencies.index(st.session_state["to_cur"]))
+    to_cur = st.selectbox("To", currencies, index=currencies.index(st.session_state["to_cur"]), format_func=currency_label)
 
 st.session_state["from_cur"] = from_cur
 st.session_state["to_cur"] = to_cur
@@ -215,8 +244,12 @@ st.markdown("</div>", unsafe_allow_html=True)
 
 # Actions
 if refresh_clicked:
-    fetch_rates.clear()
-    st.session_state["status_text"] = "Status: Rates refreshed ✅"
+    try:
+        engine.source.refresh(engine.anchor)
+        st.session_state["status_text"] = "Status: Rates refreshed ✅"
+    except Exception as e:
+        record_error("refresh", e)
+        st.session_state["status_text"] = "Status: Refresh failed, using saved rates ❌"
     st.rerun()
 
 if swap_clicked:
@@ -244,13 +277,13 @@ if convert_clicked:
             st.session_state["status_text"] = "Status: Done ✅"
         else:
             try:
-                rates = fetch_rates(base)
-                rate = float(rates[target])
+                rate = engine.rate(base, target)
                 converted = amt * rate
                 st.session_state["result_text"] = f"Result: {converted:,.2f} {target}"
                 st.session_state["rate_text"] = f"Rate: 1 {base} = {rate:.6f} {target}"
                 st.session_state["status_text"] = "Status: Done ✅"
-            except Exception:
+            except Exception as e:
+                record_error("convert", e)
                 st.session_state["status_text"] = "Status: Network error ❌"
                 st.error("Network/API error. Check internet and try again.")
 